@@ -1,8 +1,58 @@
 # Written by Kelvin Addy
 
 """This module contains a class with methods that implements some numerical methods algorithms"""
+import heapq
+import itertools
+import math
+
 import numpy as np
 
+# Status codes of the lanes of the batched open methods
+CONVERGED, MAX_ITERATIONS, DIVERGED, ZERO_DIVISION = range(4)
+
+# Grid points per unit length, and bounds on their number, used by find_all_roots
+GRID_DENSITY = 1_000
+MIN_GRID_POINTS, MAX_GRID_POINTS = 1_000, 1_000_000
+
+# Largest number of nodes evaluated in one vectorized call
+CHUNK_SIZE = 2 ** 20
+# Number of Monte Carlo samples drawn and evaluated at a time
+BATCH_SIZE = 2 ** 16
+
+# Nodes and weights of the 15 point Kronrod rule and its embedded 7 point Gauss rule on [-1, 1]
+_kronrod_x = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                       0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                       0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                       0.207784955007898467600689403773245, 0.0])
+_kronrod_w = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                       0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                       0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                       0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_gauss_w = np.array([0.0, 0.129484966168869693270611432679082, 0.0, 0.279705391489276667901467771423780,
+                     0.0, 0.381830050505118944950369775488975, 0.0, 0.417959183673469387755102040816327])
+KRONROD_NODES = np.concatenate((-_kronrod_x[:-1], _kronrod_x[::-1]))
+KRONROD_WEIGHTS = np.concatenate((_kronrod_w[:-1], _kronrod_w[::-1]))
+GAUSS_WEIGHTS = np.concatenate((_gauss_w[:-1], _gauss_w[::-1]))
+
+# Gauss-Legendre nodes and weights by order, filled by Algorithms.gauss_legendre_nodes
+GAUSS_LEGENDRE_CACHE = {}
+
+
+class CountedFunction:
+    """Wraps a function and counts how many times, and at how many points, it is evaluated"""
+    def __init__(self, f):
+        self.f = f
+        self.reset()
+
+    def __call__(self, x):
+        self.calls += 1
+        self.evaluations += np.size(x)
+        return self.f(x)
+
+    def reset(self):
+        self.calls = 0
+        self.evaluations = 0
+
 
 class Algorithms:
     # .............Root solving algorithms..........
@@ -56,8 +106,8 @@ class Algorithms:
             a, b = b, a
             lower, upper = upper, lower
 
-        assert y >= (lower := f(a)), f"y is smaller than the lower bound. {y} < {lower}"
-        assert y <= (upper := f(b)), f"y is larger than the upper bound. {y} > {upper}"
+        assert y >= lower, f"y is smaller than the lower bound. {y} < {lower}"
+        assert y <= upper, f"y is larger than the upper bound. {y} > {upper}"
 
         while 1:
             count += 1
@@ -86,8 +136,8 @@ class Algorithms:
         if (lower := f(a)) > (upper := f(b)):
             a, b = b, a
             lower, upper = upper, lower
-        assert y >= (lower := f(a)), f"y is smaller than the lower bound. {y} < {lower}"
-        assert y <= (upper := f(b)), f"y is larger than the upper bound. {y} > {upper}"
+        assert y >= lower, f"y is smaller than the lower bound. {y} < {lower}"
+        assert y <= upper, f"y is larger than the upper bound. {y} > {upper}"
 
         stagnant = 0
         count = 0
@@ -110,6 +160,70 @@ class Algorithms:
                     upper -= (upper - y) / 2
                 stagnant = 1
 
+    def brent_algorithm(self, f, a, b, y=0, margin=.00_001):
+        ''' Bracketed approach of Root-finding with brent's method, inverse quadratic
+        interpolation and secant steps safeguarded by bisection
+        Parameters
+        ----------
+        f: callable, continuous function
+        a: float, lower bound to be searched
+        b: float, upper bound to be searched
+        y: float, target value
+        margin: float, margin of error in absolute term
+        Returns
+        -------
+        A float b, where f(b) is within the margin of y, the number of iterations
+        and the number of evaluations of f
+        '''
+        y_a, y_b = f(a) - y, f(b) - y
+        evals = 2
+        assert y_a * y_b <= 0, f"y is not within the bounds. {y} not in [{y_a + y}, {y_b + y}]"
+
+        c, y_c = b, y_b
+        count = 0
+        while True:
+            count += 1
+            if (y_b > 0) == (y_c > 0):
+                # Keeps the root between b and c
+                c, y_c = a, y_a
+                d = e = b - a
+            if abs(y_c) < abs(y_b):
+                # b is the best estimate so far
+                a, b, c = b, c, b
+                y_a, y_b, y_c = y_b, y_c, y_b
+
+            tol = 2 * np.finfo(float).eps * abs(b)
+            m = (c - b) / 2
+            if abs(y_b) < margin or abs(m) <= tol or count > 2e6:
+                # found!
+                return b, count, evals
+
+            if abs(e) >= tol and abs(y_a) > abs(y_b):
+                s = y_b / y_a
+                if a == c:
+                    # Secant step
+                    p, q = 2 * m * s, 1 - s
+                else:
+                    # Inverse quadratic interpolation step
+                    q, r = y_a / y_c, y_b / y_c
+                    p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                    q = (q - 1) * (r - 1) * (s - 1)
+                if p > 0:
+                    q = -q
+                p = abs(p)
+                if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                    e, d = d, p / q
+                else:
+                    # Interpolation is not converging fast enough, bisect instead
+                    d = e = m
+            else:
+                d = e = m
+
+            a, y_a = b, y_b
+            b += d if abs(d) > tol else math.copysign(tol, m)
+            y_b = f(b) - y
+            evals += 1
+
     def secant_algorithm(self, f, x_0, x_1, y=0, margin=.00_001):
         ''' Iterative approach of Root-finding with secant method
         Parameters
@@ -164,10 +278,10 @@ class Algorithms:
         while True:
             count += 1
             g = (f(x + y_x) - y) / y_x - 1
-            if g * x == 0:
+            if g == 0:
                 # Division by zero, search stops
                 return x, count
-            x -= (f(x) - y) / (g * x)
+            x -= y_x / g
             if abs((y_x := f(x) - y)) < margin or count > 2e6:
                 # found!
                 return x, count
@@ -191,10 +305,398 @@ class Algorithms:
             if abs(y_x := f(x_2)) < tolerance or count > 2e6:
                 return x_2, count
 
-            x_2 = x_2 - f(x_2) / df(x_2)
+            x_2 = x_2 - y_x / df(x_2)
+
+    def newton_raphson_auto(self, derivatives, x_2, tolerance):
+        ''' Iterative approach of Root-finding with the newton-raphson method, where f and
+            its derivative come from one evaluation, see autodiff.derivatives
+            Parameters
+            ----------
+            derivatives: callable, returns f(x), f'(x) and optionally more derivatives
+            x_2: float, initial seed
+            tolerance: float, margin of error in absolute term
+            Returns
+            -------
+            A float x_2, where f(x_2) is within the margin of y
+        '''
+        count = 0
+        while True:
+            count += 1
+            y_x, dy_x, *_ = derivatives(x_2)
+            if abs(y_x) < tolerance or count > 2e6:
+                return x_2, count
+
+            x_2 = x_2 - y_x / dy_x
+
+    # .............Batched root solving algorithms..........
+    def bracket_batch(self, f, a, b, y=0, margin=.00_001, method="bisection", max_iter=10_000):
+        ''' Solves many brackets at once, advancing every lane in lock-step
+        Parameters
+        ----------
+        f: callable, continuous function accepting ndarrays
+        a: float or ndarray, lower bounds to be searched
+        b: float or ndarray, upper bounds to be searched
+        y: float or ndarray, target values
+        margin: float, margin of error in absolute term
+        method: str, "bisection", "regula_falsi" or "illinois"
+        max_iter: int, largest number of iterations of a lane
+        Returns
+        -------
+        An ndarray of roots c, where f(c) is within the margin of y, and an ndarray
+        of iteration counts. Lanes whose y is outside [f(a), f(b)] get a nan root
+        and a count of 0. Lanes that hit max_iter without converging, such as
+        brackets of a pole, get a nan root and a count of max_iter.
+        '''
+        if method not in ("bisection", "regula_falsi", "illinois"):
+            raise ValueError(f"Unknown bracketing method '{method}'")
+
+        a, b, y = (np.array(i, dtype=float) for i in np.broadcast_arrays(a, b, y))
+        shape = a.shape
+        a, b, y = a.ravel(), b.ravel(), y.ravel()
+        roots = np.full(a.size, np.nan)
+        counts = np.zeros(a.size, dtype=int)
+
+        # One evaluation for both ends of every bracket
+        lower, upper = np.split(self.evaluate_array(f, np.concatenate((a, b))), 2)
+        swap = lower > upper
+        a[swap], b[swap] = b[swap], a[swap]
+        lower[swap], upper[swap] = upper[swap], lower[swap]
+
+        # Lanes still being searched, lanes with y outside the bracket are never searched
+        active = np.flatnonzero((y >= lower) & (y <= upper))
+        a, b, y, lower, upper = a[active], b[active], y[active], lower[active], upper[active]
+        stagnant = np.zeros(active.size, dtype=int)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for count in range(1, max_iter + 1):
+                if method == "bisection":
+                    c = (a + b) / 2
+                else:
+                    c = ((a * (upper - y)) - (b * (lower - y))) / (upper - lower)
+                y_c = self.evaluate_array(f, c)
+
+                # Retires the converged lanes
+                found = np.abs(y_c - y) < margin
+                roots[active[found]] = c[found]
+                counts[active[found]] = count
+                if found.all():
+                    break
+                if count == max_iter:
+                    counts[active[~found]] = count
+                    break
+                keep = ~found
+                active, a, b, y, c, y_c = active[keep], a[keep], b[keep], y[keep], c[keep], y_c[keep]
+                lower, upper, stagnant = lower[keep], upper[keep], stagnant[keep]
+
+                below = y < y_c
+                b = np.where(below, c, b)
+                upper = np.where(below, y_c, upper)
+                a = np.where(below, a, c)
+                lower = np.where(below, lower, y_c)
+                if method == "illinois":
+                    # Halves the distance to y of a bound that stays put twice in a row
+                    lower = np.where(below & (stagnant == -1), lower + (y - lower) / 2, lower)
+                    upper = np.where(~below & (stagnant == 1), upper - (upper - y) / 2, upper)
+                    stagnant = np.where(below, -1, 1)
+
+        return roots.reshape(shape), counts.reshape(shape)
+
+    def bisection_batch(self, f, a, b, y=0, margin=.00_001, max_iter=10_000):
+        ''' Bracketed Root-finding with bisection method over arrays of brackets, see bracket_batch '''
+        return self.bracket_batch(f, a, b, y, margin, "bisection", max_iter)
+
+    def regula_falsi_batch(self, f, a, b, y=0, margin=.00_001, max_iter=10_000):
+        ''' Bracketed Root-finding with regula-falsi method over arrays of brackets, see bracket_batch '''
+        return self.bracket_batch(f, a, b, y, margin, "regula_falsi", max_iter)
+
+    def illinois_batch(self, f, a, b, y=0, margin=.00_001, max_iter=10_000):
+        ''' Bracketed Root-finding with illinois method over arrays of brackets, see bracket_batch '''
+        return self.bracket_batch(f, a, b, y, margin, "illinois", max_iter)
+
+    def open_batch_result(self, size):
+        """Returns the empty roots, counts and status arrays of an open-method batch"""
+        return np.full(size, np.nan), np.zeros(size, dtype=int), np.full(size, MAX_ITERATIONS)
+
+    def newton_raphson_batch(self, f, df, x, tolerance, max_iter=10_000):
+        ''' Root-finding with the newton-raphson method over an array of initial seeds
+            Parameters
+            ----------
+            f: callable, continuous function accepting ndarrays
+            df: callable, derivative of f accepting ndarrays
+            x: ndarray, initial seeds, one lane each
+            tolerance: float, margin of error in absolute term
+            max_iter: int, largest number of iterations of a lane
+            Returns
+            -------
+            ndarrays of roots, iteration counts and status codes (CONVERGED, MAX_ITERATIONS,
+            DIVERGED or ZERO_DIVISION) per lane
+        '''
+        x = np.array(x, dtype=float)
+        shape = x.shape
+        x = x.ravel()
+        roots, counts, status = self.open_batch_result(x.size)
+        active = np.arange(x.size)
+
+        with np.errstate(all="ignore"):
+            for count in range(1, max_iter + 1):
+                y_x = self.evaluate_array(f, x)
+                dy_x = self.evaluate_array(df, x)
+                roots[active], counts[active] = x, count
+
+                # Retires converged lanes and lanes that can not go on
+                found = np.abs(y_x) < tolerance
+                diverged = ~found & ~np.isfinite(y_x)
+                flat = ~found & ~diverged & (dy_x == 0)
+                status[active[found]] = CONVERGED
+                status[active[diverged]] = DIVERGED
+                status[active[flat]] = ZERO_DIVISION
+                keep = ~(found | diverged | flat)
+                if not keep.any():
+                    break
+                active, x = active[keep], x[keep] - y_x[keep] / dy_x[keep]
+
+        return roots.reshape(shape), counts.reshape(shape), status.reshape(shape)
+
+    def secant_batch(self, f, x_0, x_1, y=0, margin=.00_001, max_iter=10_000):
+        ''' Root-finding with secant method over arrays of initial seeds
+        Parameters
+        ----------
+        f: callable, continuous function accepting ndarrays
+        x_0: ndarray, initial seeds, one lane each
+        x_1: ndarray, initial seeds, one lane each
+        y: float or ndarray, target values
+        margin: float, margin of error in absolute term
+        max_iter: int, largest number of iterations of a lane
+        Returns
+        -------
+        ndarrays of roots, iteration counts and status codes (CONVERGED, MAX_ITERATIONS,
+        DIVERGED or ZERO_DIVISION) per lane
+        '''
+        x_0, x_1, y = (np.array(i, dtype=float) for i in np.broadcast_arrays(x_0, x_1, y))
+        shape = x_0.shape
+        x_0, x_1, y = x_0.ravel(), x_1.ravel(), y.ravel()
+        roots, counts, status = self.open_batch_result(x_0.size)
+
+        # One evaluation for both seeds of every lane
+        y_0, y_1 = np.split(self.evaluate_array(f, np.concatenate((x_0, x_1))) - np.tile(y, 2), 2)
+        found_0 = np.abs(y_0) < margin
+        found_1 = ~found_0 & (np.abs(y_1) < margin)
+        roots[found_0], roots[found_1] = x_0[found_0], x_1[found_1]
+        status[found_0 | found_1] = CONVERGED
+        active = np.flatnonzero(~(found_0 | found_1))
+        x_0, x_1, y, y_0, y_1 = x_0[active], x_1[active], y[active], y_0[active], y_1[active]
+
+        with np.errstate(all="ignore"):
+            for count in range(1, max_iter + 1):
+                if not active.size:
+                    break
+                x_2 = x_1 - y_1 * (x_1 - x_0) / (y_1 - y_0)
+                y_2 = self.evaluate_array(f, x_2) - y
+                roots[active], counts[active] = x_2, count
+
+                # Retires converged lanes and lanes that can not go on
+                found = np.abs(y_2) < margin
+                diverged = ~found & ~np.isfinite(y_2)
+                flat = ~found & ~diverged & (y_2 == y_1)
+                status[active[found]] = CONVERGED
+                status[active[diverged]] = DIVERGED
+                status[active[flat]] = ZERO_DIVISION
+                keep = ~(found | diverged | flat)
+                active, y = active[keep], y[keep]
+                x_0, x_1 = x_1[keep], x_2[keep]
+                y_0, y_1 = y_1[keep], y_2[keep]
+
+        return roots.reshape(shape), counts.reshape(shape), status.reshape(shape)
+
+    def steffensen_batch(self, f, x, y=0, margin=.00_001, max_iter=10_000):
+        ''' Root-finding with steffensen's method over an array of initial seeds
+        Parameters
+        ----------
+        f: callable, continuous function accepting ndarrays
+        x: ndarray, initial seeds, one lane each
+        y: float or ndarray, target values
+        margin: float, margin of error in absolute term
+        max_iter: int, largest number of iterations of a lane
+        Returns
+        -------
+        ndarrays of roots, iteration counts and status codes (CONVERGED, MAX_ITERATIONS,
+        DIVERGED or ZERO_DIVISION) per lane
+        '''
+        x, y = (np.array(i, dtype=float) for i in np.broadcast_arrays(x, y))
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        roots, counts, status = self.open_batch_result(x.size)
+        active = np.arange(x.size)
+
+        with np.errstate(all="ignore"):
+            y_x = self.evaluate_array(f, x) - y
+            for count in range(max_iter + 1):
+                roots[active], counts[active] = x, count
+
+                # Retires converged lanes and lanes that can not go on
+                found = np.abs(y_x) < margin
+                diverged = ~found & ~np.isfinite(y_x)
+                status[active[found]] = CONVERGED
+                status[active[diverged]] = DIVERGED
+                keep = ~(found | diverged)
+                active, x, y, y_x = active[keep], x[keep], y[keep], y_x[keep]
+                if not active.size or count == max_iter:
+                    break
+
+                g = (self.evaluate_array(f, x + y_x) - y) / y_x - 1
+                flat = g == 0
+                status[active[flat]] = ZERO_DIVISION
+                roots[active[flat]], counts[active[flat]] = x[flat], count + 1
+                active, x, y, y_x, g = active[~flat], x[~flat], y[~flat], y_x[~flat], g[~flat]
+                x = x - y_x / g
+                y_x = self.evaluate_array(f, x) - y
+
+        return roots.reshape(shape), counts.reshape(shape), status.reshape(shape)
+
+    def find_all_roots(self, f, a, b, y=0, margin=.00_001, method="illinois", points=None):
+        ''' Finds every root of f(x) = y on [a, b]
+        f is sampled on a grid over [a, b], every sign change of f - y is refined at
+        once with bracket_batch, and local minima of |f - y| without a sign change
+        are refined with golden_section_batch to catch roots of even multiplicity.
+        Grid points where f - y is exactly 0, and a or b when f - y is within the margin
+        there and grows inwards, are roots as they are.
+        Parameters
+        ----------
+        f: callable, continuous function accepting ndarrays
+        a: float, lower bound to be searched
+        b: float, upper bound to be searched
+        y: float, target value
+        margin: float, margin of error in absolute term
+        method: str, bracketing method of bracket_batch used on the sign changes
+        points: int, number of grid points, by default GRID_DENSITY per unit length
+        Returns
+        -------
+        Sorted ndarrays of the roots found and their iteration counts
+        '''
+        if points is None:
+            # Grid density adapts to the interval length
+            points = int(np.clip(GRID_DENSITY * abs(b - a), MIN_GRID_POINTS, MAX_GRID_POINTS))
+        x = np.linspace(a, b, points)
+        g = self.evaluate_array(f, x) - y
+
+        # Sign changes of f - y between neighbouring grid points
+        change = np.flatnonzero(g[:-1] * g[1:] < 0)
+        roots, counts = self.bracket_batch(f, x[change], x[change + 1], y, margin, method)
+        # Sign changes across a pole never converge, their lanes are nan
+        converged = np.isfinite(roots)
+        converged[converged] = np.abs(self.evaluate_array(f, roots[converged]) - y) < margin
+        roots, counts = roots[converged], counts[converged]
+
+        # Roots on the grid, a run of them is reported once
+        zero = np.flatnonzero(g == 0)
+        zero = zero[np.diff(zero, prepend=-2) > 1]
+        roots = np.concatenate((roots, x[zero]))
+        counts = np.concatenate((counts, np.zeros(zero.size, dtype=int)))
+
+        # Local minima of |f - y| next to no sign change, such as double roots
+        size = np.abs(g)
+        crossed = np.zeros(points, dtype=bool)
+        crossed[change] = crossed[change + 1] = True
+        minimum = np.flatnonzero((size[1:-1] <= size[:-2]) & (size[1:-1] <= size[2:]) & ~crossed[1:-1]
+                                 & (size[1:-1] > 0)) + 1
+        # A plateau is reported once
+        minimum = minimum[np.diff(minimum, prepend=-2) > 1]
+
+        # Ends closer to a root than their neighbour, within the margin, are roots as they are
+        ends = np.array([end for end, inner in ((0, 1), (points - 1, points - 2))
+                         if 0 < size[end] < margin and size[end] <= size[inner] and not crossed[end]], dtype=int)
+        roots = np.concatenate((roots, x[ends]))
+        counts = np.concatenate((counts, np.zeros(ends.size, dtype=int)))
+        if minimum.size:
+            step = x[1] - x[0]
+            x_min, count_min = self.golden_section_batch(lambda t: np.abs(self.evaluate_array(f, t) - y),
+                                                         x[minimum - 1], x[minimum + 1], abs(step) * 1e-9)
+            near_zero = np.abs(self.evaluate_array(f, x_min) - y) < margin
+            roots = np.concatenate((roots, x_min[near_zero]))
+            counts = np.concatenate((counts, count_min[near_zero]))
+
+        found = np.isfinite(roots)
+        order = np.argsort(roots[found])
+        return roots[found][order], counts[found][order]
 
     # .............Numerical integration algorithms..........
-    def simpsons_3rd_rule(self, f, a, b, n):
+    def rule_weights(self, rule, i, n):
+        """Returns the weights of the composite rule at the node indices i of an n interval grid
+
+        Parameters
+        ----------
+        rule : str
+            One of "simpson3", "simpson8" or "trapezoid".
+        i : ndarray
+            Node indices in the range 0..n.
+        n : int
+            The number of intervals of the grid.
+
+        Returns
+        -------
+        ndarray
+            The weight of each node, before scaling by the step size.
+        """
+        if rule == "simpson3":
+            weights = np.where(i % 2 == 1, 4.0, 2.0)
+            end_weight = 1.0
+        elif rule == "simpson8":
+            weights = np.where(i % 3 == 0, 2.0, 3.0)
+            end_weight = 1.0
+        elif rule == "trapezoid":
+            weights = np.ones(i.shape)
+            end_weight = 0.5
+        else:
+            raise ValueError(f"Unknown composite rule '{rule}'")
+
+        weights[(i == 0) | (i == n)] = end_weight
+        return weights
+
+    def weighted_sum(self, f, a, b, n, rule, chunk_size=CHUNK_SIZE, start=0, stop=None):
+        """Evaluates f on the whole node grid of a composite rule and reduces it with the rule's weights
+
+        The grid is processed in chunks of at most chunk_size nodes, so very large n
+        never needs one giant array. Returns None if f does not accept arrays.
+        start and stop restrict the sum to the nodes start..stop-1, which lets the
+        shards of parallel.py share one grid.
+
+        Parameters
+        ----------
+        f : function
+            The function to be integrated, called with an ndarray of nodes.
+        a, b : float
+            The limits of the integration.
+        n : int
+            The number of intervals to use.
+        rule : str
+            The composite rule whose weights are used, see rule_weights.
+        chunk_size : int
+            The largest number of nodes evaluated in one call of f.
+        start, stop : int
+            The node indices summed, stop defaults to n + 1.
+
+        Returns
+        -------
+        float or None
+            The weighted sum of f over the nodes, not yet scaled by the step size.
+        """
+        h = (b - a) / n
+        stop = n + 1 if stop is None else stop
+        partial_sums = []
+        for first in range(start, stop, chunk_size):
+            i = np.arange(first, min(first + chunk_size, stop))
+            x = a + i * h
+            try:
+                y = np.broadcast_to(f(x), x.shape)
+            except (TypeError, ValueError):
+                if first == start:
+                    # f only works on scalars
+                    return None
+                raise
+            partial_sums.append(float(np.dot(self.rule_weights(rule, i, n), y)))
+        return math.fsum(partial_sums)
+
+    def simpsons_3rd_rule(self, f, a, b, n, vectorized=True, chunk_size=CHUNK_SIZE):
         """
         Approximates the definite integral of a function f(x) over the interval [a, b]
         using Simpson's 1/3 rule.
@@ -204,6 +706,8 @@ class Algorithms:
         a (float): The lower bound of the interval of integration.
         b (float): The upper bound of the interval of integration.
         n (int): The number of subintervals to use in the approximation.
+        vectorized (bool): Evaluates f on arrays of nodes instead of one node at a time.
+        chunk_size (int): The largest number of nodes evaluated in one vectorized call.
 
         Returns:
         float: The approximate value of the definite integral of f(x) over the interval [a, b].
@@ -211,6 +715,9 @@ class Algorithms:
         # Compute the width of each subinterval
         h = (b - a) / n
 
+        if vectorized and (integral := self.weighted_sum(f, a, b, n, "simpson3", chunk_size)) is not None:
+            return integral * h / 3
+
         # Initialize the sum
         integral = 0
 
@@ -236,7 +743,7 @@ class Algorithms:
         # Return the approximation of the integral using Simpson's 1/3 rule
         return integral * h / 3
 
-    def simpsons_8th_rule(self, f, a, b, n):
+    def simpsons_8th_rule(self, f, a, b, n, vectorized=True, chunk_size=CHUNK_SIZE):
         """
         Approximates the definite integral of a function f(x) over the interval [a, b]
         using Simpson's 3/8 rule.
@@ -246,6 +753,8 @@ class Algorithms:
         a (float): The lower bound of the interval of integration.
         b (float): The upper bound of the interval of integration.
         n (int): The number of subintervals to use in the approximation.
+        vectorized (bool): Evaluates f on arrays of nodes instead of one node at a time.
+        chunk_size (int): The largest number of nodes evaluated in one vectorized call.
 
         Returns:
         float: The approximate value of the definite integral of f(x) over the interval [a, b].
@@ -253,6 +762,9 @@ class Algorithms:
         # Compute the width of each subinterval
         h = (b - a) / n
 
+        if vectorized and (integral := self.weighted_sum(f, a, b, n, "simpson8", chunk_size)) is not None:
+            return integral * 3 * h / 8
+
         # Initialize the sum
         integral = 0
 
@@ -265,9 +777,9 @@ class Algorithms:
             if i == 0 or i == n:
                 # If it's a starting or ending point, use a weight of 1
                 weight = 1
-            elif (i - 1) % 3 == 0:
-                # If it's a point one step away from the starting or ending point, use a weight of 3
-                weight = 3
+            elif i % 3 == 0:
+                # If it's a point shared by two panels, use a weight of 2
+                weight = 2
             else:
                 # If it's a middle point, use a weight of 3
                 weight = 3
@@ -278,7 +790,7 @@ class Algorithms:
         # Return the approximation of the integral using Simpson's 3/8 rule
         return integral * 3 * h / 8
 
-    def trapazoidal_rule(self, f, a, b, n):
+    def trapazoidal_rule(self, f, a, b, n, vectorized=True, chunk_size=CHUNK_SIZE):
         """Approximate the definite integral of f from a to b using the
         composite trapezoidal rule, with n intervals.
 
@@ -291,6 +803,10 @@ class Algorithms:
             The upper limit of the integration.
         n : int
             The number of intervals to use.
+        vectorized : bool
+            Evaluates f on arrays of nodes instead of one node at a time.
+        chunk_size : int
+            The largest number of nodes evaluated in one vectorized call.
 
         Returns
         -------
@@ -298,14 +814,282 @@ class Algorithms:
             The approximate integral of f from a to b.
         """
         h = (b - a) / n
+        if vectorized and (s := self.weighted_sum(f, a, b, n, "trapezoid", chunk_size)) is not None:
+            return h * s
+
         s = 0.5 * (f(a) + f(b))
         for i in range(1, n):
             s += f(a + i * h)
         return h * s
 
-    def monte_carlo(self, f, a, b, n):
+    def trapezoid_data(self, x, y, chunk_size=CHUNK_SIZE, progress=None):
+        """Approximate the integral of tabulated data with the trapezoidal rule,
+        the x values may be spaced unevenly.
+
+        The arrays are read chunk_size points at a time, so memory mapped data of
+        any length is integrated in a single pass without being copied whole.
+
+        Parameters
+        ----------
+        x, y : array_like
+            The samples, x in increasing or decreasing order.
+        chunk_size : int
+            The largest number of points read at a time.
+        progress : callable, optional
+            Called with the number of points of every chunk read, it may raise to stop.
+
+        Returns
+        -------
+        float
+            The approximate integral of the data from x[0] to x[-1].
+        """
+        n = len(x)
+        if n < 2 or len(y) != n:
+            raise ValueError("The data needs at least two points and as many y values as x values")
+        partial_sums = []
+        # Consecutive chunks share their boundary point
+        for start in range(0, n - 1, chunk_size):
+            stop = min(start + chunk_size, n - 1)
+            xs, ys = np.asarray(x[start:stop + 1], dtype=float), np.asarray(y[start:stop + 1], dtype=float)
+            partial_sums.append(0.5 * float(np.dot(np.diff(xs), ys[1:] + ys[:-1])))
+            if progress is not None:
+                progress(stop - start)
+        return math.fsum(partial_sums)
+
+    def simpson_data(self, x, y, chunk_size=CHUNK_SIZE, progress=None):
+        """Approximate the integral of tabulated data with Simpson's 1/3 rule,
+        the x values may be spaced unevenly.
+
+        Every pair of intervals is integrated exactly for the parabola through its three
+        points. With an odd number of intervals, the last one is integrated with the
+        parabola through the last three points. The arrays are read chunk_size points
+        at a time, like trapezoid_data.
+
+        Parameters
+        ----------
+        x, y : array_like
+            The samples, x in increasing or decreasing order without repeated values.
+        chunk_size : int
+            The largest number of points read at a time.
+        progress : callable, optional
+            Called with the number of points of every chunk read, it may raise to stop.
+
+        Returns
+        -------
+        float
+            The approximate integral of the data from x[0] to x[-1].
+        """
+        n = len(x)
+        if n < 3:
+            # A single interval
+            return self.trapezoid_data(x, y, chunk_size, progress)
+        if len(y) != n:
+            raise ValueError("The data needs as many y values as x values")
+
+        # Chunks hold whole pairs of intervals and share their boundary point
+        last_pair_end = 2 * ((n - 1) // 2)
+        step = max(chunk_size - chunk_size % 2, 2)
+        partial_sums = []
+        for start in range(0, last_pair_end, step):
+            stop = min(start + step, last_pair_end)
+            xs, ys = np.asarray(x[start:stop + 1], dtype=float), np.asarray(y[start:stop + 1], dtype=float)
+            left, right = self.parabola_areas(xs[:-2:2], xs[1:-1:2], xs[2::2], ys[:-2:2], ys[1:-1:2], ys[2::2])
+            partial_sums.append(float(np.sum(left + right)))
+            if progress is not None:
+                progress(stop - start)
+
+        if last_pair_end < n - 1:
+            # The last interval, under the parabola through the last three points
+            _, right = self.parabola_areas(*np.asarray(x[-3:], dtype=float), *np.asarray(y[-3:], dtype=float))
+            partial_sums.append(float(right))
+            if progress is not None:
+                progress(1)
+        return math.fsum(partial_sums)
+
+    def parabola_areas(self, x0, x1, x2, y0, y1, y2):
+        """Returns the areas under the parabola through (x0, y0), (x1, y1) and (x2, y2)
+        over [x0, x1] and over [x1, x2], elementwise for arrays
+
+        With an even step h they are h/12 (5 y0 + 8 y1 - y2) and h/12 (-y0 + 8 y1 + 5 y2),
+        the two halves of Simpson's 1/3 rule.
+        """
+        h0, h1 = x1 - x0, x2 - x1
+        if not (np.all(h0) and np.all(h1)):
+            raise ValueError("The x values of the data must not repeat")
+        h = h0 + h1
+        left = h0 / 6 * ((2 * h0 + 3 * h1) / h * y0 + (h0 + 3 * h1) / h1 * y1 - h0 ** 2 / (h1 * h) * y2)
+        right = h1 / 6 * (-h1 ** 2 / (h0 * h) * y0 + (h1 + 3 * h0) / h0 * y1 + (2 * h1 + 3 * h0) / h * y2)
+        return left, right
+
+    def cumulative_trapezoid(self, x, y, chunk_size=CHUNK_SIZE, progress=None):
+        """Running integral of tabulated data with the trapezoidal rule, in a single pass
+
+        The areas of the intervals are summed by a prefix sum, chunk_size points at a
+        time, instead of one trapezoid_data call per upper limit.
+
+        Parameters
+        ----------
+        x, y : array_like
+            The samples, see trapezoid_data.
+        chunk_size : int
+            The largest number of points read at a time.
+        progress : callable, optional
+            Called with the number of points of every chunk read, it may raise to stop.
+
+        Returns
+        -------
+        ndarray
+            The integral from x[0] to every x[i], starting with 0.
+        """
+        n = len(x)
+        if n < 2 or len(y) != n:
+            raise ValueError("The data needs at least two points and as many y values as x values")
+        running = np.empty(n)
+        running[0] = 0.0
+        for start in range(0, n - 1, chunk_size):
+            stop = min(start + chunk_size, n - 1)
+            xs, ys = np.asarray(x[start:stop + 1], dtype=float), np.asarray(y[start:stop + 1], dtype=float)
+            # Continues from the running integral at the start of the chunk
+            np.cumsum(0.5 * np.diff(xs) * (ys[1:] + ys[:-1]), out=running[start + 1:stop + 1])
+            running[start + 1:stop + 1] += running[start]
+            if progress is not None:
+                progress(stop - start)
+        return running
+
+    def cumulative_simpson(self, x, y, chunk_size=CHUNK_SIZE, progress=None):
+        """Running integral of tabulated data with Simpson's 1/3 rule, in a single pass
+
+        Every interval gets its area under the parabola through its pair of intervals,
+        see parabola_areas, so the running integral at the end of every pair equals
+        simpson_data up to that point. With an odd number of intervals, the last one
+        uses the parabola through the last three points, like simpson_data.
+
+        Parameters
+        ----------
+        x, y : array_like
+            The samples, see simpson_data.
+        chunk_size : int
+            The largest number of points read at a time.
+        progress : callable, optional
+            Called with the number of points of every chunk read, it may raise to stop.
+
+        Returns
+        -------
+        ndarray
+            The integral from x[0] to every x[i], starting with 0.
+        """
+        n = len(x)
+        if n < 3:
+            # A single interval
+            return self.cumulative_trapezoid(x, y, chunk_size, progress)
+        if len(y) != n:
+            raise ValueError("The data needs as many y values as x values")
+
+        running = np.empty(n)
+        running[0] = 0.0
+        last_pair_end = 2 * ((n - 1) // 2)
+        step = max(chunk_size - chunk_size % 2, 2)
+        for start in range(0, last_pair_end, step):
+            stop = min(start + step, last_pair_end)
+            xs, ys = np.asarray(x[start:stop + 1], dtype=float), np.asarray(y[start:stop + 1], dtype=float)
+            areas = np.empty(stop - start)
+            areas[0::2], areas[1::2] = self.parabola_areas(xs[:-2:2], xs[1:-1:2], xs[2::2],
+                                                           ys[:-2:2], ys[1:-1:2], ys[2::2])
+            np.cumsum(areas, out=running[start + 1:stop + 1])
+            running[start + 1:stop + 1] += running[start]
+            if progress is not None:
+                progress(stop - start)
+
+        if last_pair_end < n - 1:
+            _, right = self.parabola_areas(*np.asarray(x[-3:], dtype=float), *np.asarray(y[-3:], dtype=float))
+            running[-1] = running[-2] + right
+            if progress is not None:
+                progress(1)
+        return running
+
+    def romberg(self, f, a, b, tol=1e-8, max_steps=25, chunk_size=CHUNK_SIZE):
+        """Approximate the definite integral of f from a to b using
+        Romberg integration, Richardson extrapolation of the trapezoidal rule.
+
+        Every refinement halves the step of trapazoidal_rule and evaluates f only at
+        the new midpoints, the previous nodes are carried in the previous estimate.
+        Only the last row of the extrapolation table is kept.
+
+        Parameters
+        ----------
+        f : function
+            The function to be integrated.
+        a : float
+            The lower limit of the integration.
+        b : float
+            The upper limit of the integration.
+        tol : float
+            Stops once successive diagonal entries of the table agree within tol.
+        max_steps : int
+            The largest number of refinements, the last one uses 2**max_steps intervals.
+        chunk_size : int
+            The largest number of midpoints evaluated in one vectorized call.
+
+        Returns
+        -------
+        tuple
+            The approximate integral, the difference of the last two diagonal entries
+            and the number of evaluations of f.
+        """
+        row = [self.trapazoidal_rule(f, a, b, 1)]
+        evals, n = 2, 1
+        error = math.inf
+        for step in range(1, max_steps + 1):
+            # Trapezoidal rule with half the step from the new midpoints only
+            h = (b - a) / (2 * n)
+            partial_sums = []
+            for start in range(0, n, chunk_size):
+                x = a + h * (2 * np.arange(start, min(start + chunk_size, n)) + 1)
+                partial_sums.append(float(np.sum(self.evaluate_array(f, x))))
+            evals += n
+            n *= 2
+
+            # Extends the extrapolation table by one row
+            new_row = [row[0] / 2 + h * math.fsum(partial_sums)]
+            for j in range(1, step + 1):
+                new_row.append(new_row[j - 1] + (new_row[j - 1] - row[j - 1]) / (4 ** j - 1))
+
+            error = abs(new_row[-1] - row[-1])
+            row = new_row
+            if error <= tol and step > 1:
+                break
+
+        return row[-1], error, evals
+
+    def gauss_legendre_nodes(self, m):
+        """Returns the nodes and weights of the m point Gauss-Legendre rule on [-1, 1]
+
+        They are computed once per order and kept in memory, see also
+        save_gauss_nodes and load_gauss_nodes.
+        """
+        if m not in GAUSS_LEGENDRE_CACHE:
+            GAUSS_LEGENDRE_CACHE[m] = np.polynomial.legendre.leggauss(m)
+        return GAUSS_LEGENDRE_CACHE[m]
+
+    def save_gauss_nodes(self, path):
+        """Writes every cached Gauss-Legendre rule to the .npz file at path"""
+        arrays = {}
+        for m, (nodes, weights) in GAUSS_LEGENDRE_CACHE.items():
+            arrays[f"nodes_{m}"] = nodes
+            arrays[f"weights_{m}"] = weights
+        np.savez(path, **arrays)
+
+    def load_gauss_nodes(self, path):
+        """Adds the Gauss-Legendre rules saved by save_gauss_nodes at path to the cache"""
+        with np.load(path) as arrays:
+            for name in arrays.files:
+                if name.startswith("nodes_"):
+                    m = int(name[len("nodes_"):])
+                    GAUSS_LEGENDRE_CACHE[m] = arrays[name], arrays[f"weights_{m}"]
+
+    def gauss_legendre(self, f, a, b, m=5, n=1, chunk_size=CHUNK_SIZE):
         """Approximate the definite integral of f from a to b using the
-        Monte Carlo method, with n samples.
+        composite m point Gauss-Legendre rule, with n intervals.
 
         Parameters
         ----------
@@ -315,19 +1099,257 @@ class Algorithms:
             The lower limit of the integration.
         b : float
             The upper limit of the integration.
+        m : int
+            The number of Gauss-Legendre nodes in each interval.
         n : int
-            The number of samples to use.
+            The number of intervals to use.
+        chunk_size : int
+            The largest number of nodes evaluated in one vectorized call.
 
         Returns
         -------
         float
             The approximate integral of f from a to b.
         """
-        s = 0
-        for i in range(n):
-            x = np.random.uniform(a, b)
-            s += f(x)
-        return (b - a) * s / n
+        nodes, weights = self.gauss_legendre_nodes(m)
+        half = (b - a) / (2 * n)
+        panels = max(chunk_size // m, 1)
+
+        partial_sums = []
+        for start in range(0, n, panels):
+            # Nodes of a chunk of intervals, one row per interval
+            centres = a + half * (2 * np.arange(start, min(start + panels, n)) + 1)
+            y = self.evaluate_array(f, (centres[:, None] + half * nodes).ravel())
+            partial_sums.append(float(np.dot(y.reshape(-1, m).sum(axis=0), weights)))
+        return half * math.fsum(partial_sums)
+
+    def evaluate_array(self, f, x):
+        """Evaluates f on the ndarray x, one element at a time if f does not accept arrays"""
+        try:
+            y = np.asarray(f(x), dtype=float)
+            return y if y.shape == x.shape else np.full(x.shape, y)
+        except (TypeError, ValueError):
+            return np.fromiter((f(i) for i in x), dtype=float, count=x.size)
+
+    def monte_carlo(self, f, a, b, n, seed=None, sampling="plain", tol=None, batch_size=BATCH_SIZE):
+        """Approximate the definite integral of f from a to b using the
+        Monte Carlo method, with n samples.
+
+        Samples are drawn in blocks of batch_size from a seeded np.random.Generator
+        and f is evaluated on a whole block at a time. The mean and variance of the
+        samples are updated block by block, which gives the standard error of the
+        estimate without keeping the samples.
+
+        Parameters
+        ----------
+        f : function
+            The function to be integrated.
+        a : float
+            The lower limit of the integration.
+        b : float
+            The upper limit of the integration.
+        n : int
+            The number of samples to use, at least 1.
+        seed : int, optional
+            Seed of the random number generator, the same seed gives the same estimate.
+        sampling : str
+            "plain" for independent samples, "antithetic" to pair every sample x with
+            a + b - x, the last sample of an odd n being unpaired, or "stratified" to
+            draw one sample from each of batch_size equal strata of [a, b] per block.
+        tol : float, optional
+            Stops before n samples once the standard error is at most tol.
+        batch_size : int
+            The number of samples drawn and evaluated at a time.
+
+        Returns
+        -------
+        tuple
+            The approximate integral of f from a to b and its standard error.
+        """
+        if n < 1:
+            raise ValueError("The Monte Carlo method needs at least one sample")
+        rng = np.random.default_rng(seed)
+        width = b - a
+
+        if sampling == "stratified":
+            # Every block is one observation, so the error needs at least two equal blocks
+            blocks = max(2, -(-n // batch_size)) if n > 1 else 1
+            batch_size = max(n // blocks, 1)
+        elif sampling not in ("plain", "antithetic"):
+            raise ValueError(f"Unknown sampling method '{sampling}'")
+
+        # Running count, mean and sum of squared deviations of the observations
+        count, mean, m2 = 0, 0.0, 0.0
+        samples = 0
+        while samples < n:
+            size = min(batch_size, n - samples)
+            if sampling == "stratified" and n - samples < 2 * batch_size:
+                # The last block takes the remainder, a tiny block would weigh as much as a full one
+                size = n - samples
+            if sampling == "plain":
+                observations = self.evaluate_array(f, a + width * rng.random(size))
+            elif sampling == "antithetic":
+                u = rng.random(size // 2)
+                observations = (self.evaluate_array(f, a + width * u) + self.evaluate_array(f, b - width * u)) / 2
+                if size % 2:
+                    # The last sample of an odd block has no partner
+                    observations = np.append(observations, self.evaluate_array(f, a + width * rng.random(1)))
+            else:
+                u = (np.arange(size) + rng.random(size)) / size
+                observations = np.array([self.evaluate_array(f, a + width * u).mean()])
+            samples += size
+
+            # Merges the block statistics into the running ones
+            block_count = observations.size
+            block_mean = observations.mean()
+            block_m2 = float(np.sum((observations - block_mean) ** 2))
+            delta = block_mean - mean
+            total = count + block_count
+            mean += delta * block_count / total
+            m2 += block_m2 + delta ** 2 * count * block_count / total
+            count = total
+
+            error = width * math.sqrt(m2 / (count - 1) / count) if count > 1 else math.inf
+            if tol is not None and error <= tol:
+                break
+
+        return float(width * mean), error
+
+    def subdivide(self, interval, split, cost, a, b, tol, max_evals, evals):
+        """Global adaptive subdivision shared by adaptive_simpson and gauss_kronrod
+
+        The interval with the largest error estimate is split first. Intervals whose
+        error is within their share of tol leave the heap for good, so the heap holds
+        only intervals that still need work and never more than max_evals / cost of them.
+
+        Parameters
+        ----------
+        interval : tuple
+            (value, error, lower, upper, points) estimate over the whole of [a, b].
+        split : function
+            Takes an interval tuple and returns the tuples of its two halves.
+        cost : int
+            The number of evaluations of f spent by one split.
+        a, b : float
+            The limits of the integration.
+        tol : float
+            The absolute error wanted for the whole integral.
+        max_evals : int
+            The largest number of evaluations of f to spend.
+        evals : int
+            The number of evaluations already spent on interval.
+
+        Returns
+        -------
+        tuple
+            The integral, its error estimate and the number of evaluations spent.
+        """
+        width = abs(b - a)
+        if width == 0:
+            # An empty interval, like the fixed-grid rules
+            return 0.0, 0.0, evals
+        done_values, done_errors = [], []
+        heap, order = [], itertools.count()
+
+        def push(interval):
+            value, error, lower, upper, _ = interval
+            if error <= tol * abs(upper - lower) / width or abs(upper - lower) <= 1e-12 * width:
+                done_values.append(value)
+                done_errors.append(error)
+            else:
+                heapq.heappush(heap, (-error, next(order), interval))
+
+        push(interval)
+        error = interval[1]
+        while heap and error > tol and evals + cost <= max_evals:
+            _, _, interval = heapq.heappop(heap)
+            children = split(interval)
+            evals += cost
+            error += sum(child[1] for child in children) - interval[1]
+            for child in children:
+                push(child)
+
+        active = [interval for *_, interval in heap]
+        integral = math.fsum(done_values + [interval[0] for interval in active])
+        error = math.fsum(done_errors + [interval[1] for interval in active])
+        return integral, error, evals
+
+    def adaptive_simpson(self, f, a, b, tol=1e-8, max_evals=100_000):
+        """Approximate the definite integral of f from a to b using
+        adaptive Simpson's rule, subdividing only where the local error is large.
+
+        Parameters
+        ----------
+        f : function
+            The function to be integrated.
+        a : float
+            The lower limit of the integration.
+        b : float
+            The upper limit of the integration.
+        tol : float
+            The absolute error wanted for the integral.
+        max_evals : int
+            The largest number of evaluations of f to spend.
+
+        Returns
+        -------
+        tuple
+            The approximate integral, its error estimate and the number of evaluations of f.
+        """
+        def estimate(lower, upper, points):
+            # Simpson's rule on the whole interval and on each half of it
+            fa, fl, fm, fr, fb = points
+            h = upper - lower
+            whole = h * (fa + 4 * fm + fb) / 6
+            halves = h * (fa + 4 * fl + 2 * fm + 4 * fr + fb) / 12
+            return halves + (halves - whole) / 15, abs(halves - whole) / 15, lower, upper, points
+
+        def split(interval):
+            *_, lower, upper, (fa, fl, fm, fr, fb) = interval
+            h = upper - lower
+            mid = lower + h / 2
+            f1, f3, f5, f7 = self.evaluate_array(f, lower + h * np.array([1, 3, 5, 7]) / 8)
+            return estimate(lower, mid, (fa, f1, fl, f3, fm)), estimate(mid, upper, (fm, f5, fr, f7, fb))
+
+        points = tuple(self.evaluate_array(f, np.linspace(a, b, 5)))
+        return self.subdivide(estimate(a, b, points), split, 4, a, b, tol, max_evals, 5)
+
+    def gauss_kronrod(self, f, a, b, tol=1e-8, max_evals=100_000):
+        """Approximate the definite integral of f from a to b using
+        adaptive Gauss-Kronrod 7/15 quadrature, subdividing only where the local error is large.
+
+        Parameters
+        ----------
+        f : function
+            The function to be integrated.
+        a : float
+            The lower limit of the integration.
+        b : float
+            The upper limit of the integration.
+        tol : float
+            The absolute error wanted for the integral.
+        max_evals : int
+            The largest number of evaluations of f to spend.
+
+        Returns
+        -------
+        tuple
+            The approximate integral, its error estimate and the number of evaluations of f.
+        """
+        def estimate(lower, upper):
+            # The 15 point Kronrod rule and its embedded 7 point Gauss rule
+            half = (upper - lower) / 2
+            y = self.evaluate_array(f, lower + half + half * KRONROD_NODES)
+            kronrod = half * np.dot(KRONROD_WEIGHTS, y)
+            gauss = half * np.dot(GAUSS_WEIGHTS, y)
+            return float(kronrod), float(abs(kronrod - gauss)), lower, upper, None
+
+        def split(interval):
+            *_, lower, upper, _ = interval
+            mid = (lower + upper) / 2
+            return estimate(lower, mid), estimate(mid, upper)
+
+        return self.subdivide(estimate(a, b), split, 30, a, b, tol, max_evals, 15)
 
     # .............Numerical optimization algorithms..........
     def golden_section_search(self, f, a, b, tol=1e-5):
@@ -337,57 +1359,102 @@ class Algorithms:
         # Calculate the distances between the points
         c = b - (b - a) / gr
         d = a + (b - a) / gr
+        # Evaluate the function at the points c and d
+        fc = f(c)
+        fd = f(d)
 
-        while abs(c - d) > tol or count > 2e6:
+        while abs(c - d) > tol and count <= 2e6:
             count += 1
-            # Evaluate the function at the points c and d
-            fc = f(c)
-            fd = f(d)
 
             if fc < fd:
-                # Set b to the value of d and recalculate c
+                # Set b to the value of d and recalculate c, the old c becomes d
                 b = d
-                d = c
+                d, fd = c, fc
                 c = b - (b - a) / gr
+                fc = f(c)
             else:
-                # Set a to the value of c and recalculate d
+                # Set a to the value of c and recalculate d, the old d becomes c
                 a = c
-                c = d
+                c, fc = d, fd
                 d = a + (b - a) / gr
+                fd = f(d)
 
         # Return the midpoint between a and b as the final result
         return (b + a) / 2, count
 
+    def golden_section_batch(self, f, a, b, tol=1e-5, max_iter=10_000):
+        ''' Golden-section search for a minimum of f in every bracket [a, b] at once
+            Parameters
+            ----------
+            f: callable, unimodal function on each bracket accepting ndarrays
+            a: ndarray, lower bounds of the brackets
+            b: ndarray, upper bounds of the brackets
+            tol: float, width of the brackets at which the search stops
+            max_iter: int, largest number of iterations
+            Returns
+            -------
+            ndarrays of the approximate minima and the iteration counts
+        '''
+        a, b = (np.array(i, dtype=float) for i in np.broadcast_arrays(a, b))
+        shape = a.shape
+        a, b = a.ravel(), b.ravel()
+        gr = (1 + 5 ** 0.5) / 2
+        c = b - (b - a) / gr
+        d = a + (b - a) / gr
+        f_c, f_d = np.split(self.evaluate_array(f, np.concatenate((c, d))), 2)
+
+        counts = np.zeros(a.shape, dtype=int)
+        for _ in range(max_iter):
+            active = np.abs(c - d) > tol
+            if not active.any():
+                break
+            counts += active
+
+            # One new point per bracket, the other is carried over
+            left = (f_c < f_d) & active
+            right = ~left & active
+            b = np.where(left, d, b)
+            a = np.where(right, c, a)
+            d, f_d = np.where(left, c, d), np.where(left, f_c, f_d)
+            c, f_c = np.where(right, d, c), np.where(right, f_d, f_c)
+            new = np.where(left, b - (b - a) / gr, a + (b - a) / gr)
+            f_new = self.evaluate_array(f, new)
+            c, f_c = np.where(left, new, c), np.where(left, f_new, f_c)
+            d, f_d = np.where(right, new, d), np.where(right, f_new, f_d)
+
+        return ((a + b) / 2).reshape(shape), counts.reshape(shape)
+
     def parabolic_interpolation(self, f, x1, x2, x3, epsilon=1e-6):
         count = 0
+        f1 = f(x1)
+        f2 = f(x2)
+        f3 = f(x3)
         while True:
             count += 1
-            # Calculate the parabolic fit through the three points
-            f1 = f(x1)
-            f2 = f(x2)
-            f3 = f(x3)
-            A = (f1 * (x2 - x3) + f2 * (x3 - x1) + f3 * (x1 - x2)) / (
-                    x1 * x1 * (x2 - x3) + x2 * x2 * (x3 - x1) + x3 * x3 * (x1 - x2))
-            B = (f1 * (x2 * x2 - x3 * x3) + f2 * (x3 * x3 - x1 * x1) + f3 * (x1 * x1 - x2 * x2)) / (
-                    x1 * (x2 - x3) * (x2 - x3) + x2 * (x3 - x1) * (x3 - x1) + x3 * (x1 - x2) * (x1 - x2))
-            C = (f1 * (x3 * x3 * x3 - x2 * x2 * x2) + f2 * (x1 * x1 * x1 - x3 * x3 * x3) + f3 * (
-                    x2 * x2 * x2 - x1 * x1 * x1)) / (
-                        x1 * x1 * (x2 - x3) + x2 * x2 * (x3 - x1) + x3 * x3 * (x1 - x2))
-
-            # Calculate the minimum of the parabolic fit
-            xmin = -B / (2 * A)
+            # Calculate the minimum of the parabolic fit through the three points
+            numerator = (x2 - x1) ** 2 * (f2 - f3) - (x2 - x3) ** 2 * (f2 - f1)
+            denominator = (x2 - x1) * (f2 - f3) - (x2 - x3) * (f2 - f1)
+            if denominator == 0:
+                # The points are on a line, no minimum can be fitted
+                return x2, count
+            xmin = x2 - numerator / (2 * denominator)
 
             # Check if we have found a satisfactory minimum
             if abs(xmin - x2) < epsilon or count > 2e6:
                 return xmin, count
 
-            # Update the bounds for the next iteration
-            if f(xmin) < f2:
-                x3 = x2
-                x2 = xmin
+            # Update the points for the next iteration, keeping the best three
+            fmin = f(xmin)
+            if fmin < f2:
+                if xmin < x2:
+                    x3, f3 = x2, f2
+                else:
+                    x1, f1 = x2, f2
+                x2, f2 = xmin, fmin
+            elif xmin < x2:
+                x1, f1 = xmin, fmin
             else:
-                x1 = x2
-                x2 = xmin
+                x3, f3 = xmin, fmin
 
     def newtons_method(self, df, dff, x_2, tolerance):
         ''' Iterative approach of Root-finding with the newton's method
@@ -408,7 +1475,28 @@ class Algorithms:
             if abs(y_x := df(x_2)) < tolerance or count > 2e6:
                 return x_2, count
 
-            x_2 = x_2 - df(x_2) / dff(x_2)
+            x_2 = x_2 - y_x / dff(x_2)
+
+    def newtons_method_auto(self, derivatives, x_2, tolerance):
+        ''' Iterative approach of optimization with the newton's method, where f' and f''
+            come from one evaluation, see autodiff.derivatives
+            Parameters
+            ----------
+            derivatives: callable, returns f(x), f'(x) and f''(x)
+            x_2: float, initial seed
+            tolerance: float, margin of error in absolute term
+            Returns
+            -------
+            A float x_2, where x_2 is the approximate minimum of f
+        '''
+        count = 0
+        while True:
+            count += 1
+            _, dy_x, ddy_x = derivatives(x_2)
+            if abs(dy_x) < tolerance or count > 2e6:
+                return x_2, count
+
+            x_2 = x_2 - dy_x / ddy_x
 
 
 if __name__ == "__main__":
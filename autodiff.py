@@ -0,0 +1,155 @@
+"""This module contains forward-mode automatic differentiation of the expressions typed into the tabs"""
+import numpy as np
+
+from expression import NAMESPACE, ExpressionCache
+
+
+class Dual:
+    """Hyper-dual number carrying a value with its first and second derivative
+
+    The parts may be floats or ndarrays, so one pass through an expression gives
+    f, f' and f'' at every point of an array.
+    """
+    __array_priority__ = 1000
+
+    def __init__(self, value, first=0.0, second=0.0):
+        self.value = value
+        self.first = first
+        self.second = second
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.first!r}, {self.second!r})"
+
+    def chain(self, h, dh, ddh):
+        """Returns h(self) from h, h' and h'' evaluated at self.value"""
+        return Dual(h, dh * self.first, ddh * self.first ** 2 + dh * self.second)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.first, -self.second)
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.first + other.first, self.second + other.second)
+        return Dual(self.value + other, self.first, self.second)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        self.first * other.value + self.value * other.first,
+                        self.second * other.value + 2 * self.first * other.first + self.value * other.second)
+        return Dual(self.value * other, self.first * other, self.second * other)
+
+    __rmul__ = __mul__
+
+    def reciprocal(self):
+        inverse = 1 / self.value
+        return self.chain(inverse, -inverse ** 2, 2 * inverse ** 3)
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return self * other.reciprocal()
+        return self * (1 / other)
+
+    def __rtruediv__(self, other):
+        return other * self.reciprocal()
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            # x ** y = exp(y * log(x))
+            return exp(other * log(self))
+        if other == 0:
+            return Dual(self.value ** 0, 0 * self.first, 0 * self.second)
+        return self.chain(self.value ** other, other * self.value ** (other - 1),
+                          other * (other - 1) * self.value ** (other - 2))
+
+    def __rpow__(self, other):
+        # c ** x = exp(x * log(c))
+        power = other ** self.value
+        return self.chain(power, power * np.log(other), power * np.log(other) ** 2)
+
+
+def sin(x):
+    if isinstance(x, Dual):
+        return x.chain(np.sin(x.value), np.cos(x.value), -np.sin(x.value))
+    return np.sin(x)
+
+
+def cos(x):
+    if isinstance(x, Dual):
+        return x.chain(np.cos(x.value), -np.sin(x.value), -np.cos(x.value))
+    return np.cos(x)
+
+
+def tan(x):
+    if isinstance(x, Dual):
+        value = np.tan(x.value)
+        sec2 = 1 + value ** 2
+        return x.chain(value, sec2, 2 * value * sec2)
+    return np.tan(x)
+
+
+def sqrt(x):
+    if isinstance(x, Dual):
+        value = np.sqrt(x.value)
+        return x.chain(value, 0.5 / value, -0.25 / (value * x.value))
+    return np.sqrt(x)
+
+
+def exp(x):
+    if isinstance(x, Dual):
+        value = np.exp(x.value)
+        return x.chain(value, value, value)
+    return np.exp(x)
+
+
+def log(x):
+    if isinstance(x, Dual):
+        return x.chain(np.log(x.value), 1 / x.value, -1 / x.value ** 2)
+    return np.log(x)
+
+
+def absolute(x):
+    if isinstance(x, Dual):
+        return x.chain(np.abs(x.value), np.sign(x.value), 0 * x.value)
+    return np.abs(x)
+
+
+# Expression namespace whose functions also accept Dual numbers
+AD_NAMESPACE = {**NAMESPACE, "sin": sin, "cos": cos, "tan": tan, "sqrt": sqrt,
+                "exp": exp, "log": log, "abs": absolute}
+
+# Cache of expressions compiled against AD_NAMESPACE
+derivative_cache = ExpressionCache(namespace=AD_NAMESPACE)
+
+
+def derivatives(text, variable="x"):
+    """Returns a callable g, where g(x) is (f(x), f'(x), f''(x)) from a single pass of text
+    Parameters
+    ----------
+    text: str, expression in python syntax, Eg: x**2 - 4*x
+    variable: str, name of the independent variable
+    Returns
+    -------
+    A callable taking a float or an ndarray x
+    """
+    function = derivative_cache.get(text, variable)
+
+    def evaluate(x):
+        zero = np.zeros_like(x, dtype=float) if np.ndim(x) else 0.0
+        result = function(Dual(x, zero + 1, zero))
+        if not isinstance(result, Dual):
+            # The expression does not depend on x
+            return result + zero, zero, zero
+        return result.value, result.first, result.second
+    return evaluate
@@ -0,0 +1,190 @@
+"""Headless batch runner for the Algorithms engine, it never imports PyQt6 or matplotlib
+
+Usage: python -m batch jobs.jsonl [--output results.jsonl] [--workers 8]
+
+Every job is a JSON object on its own line, or a row of a CSV file with a header,
+holding an optional "id", an "expression", a "method" and the keyword arguments of
+the Algorithms method, Eg:
+
+    {"id": 1, "expression": "x**3 - 81", "method": "brent", "a": 0, "b": 10, "margin": 1e-10}
+    {"id": 2, "expression": "sin(x)", "method": "romberg", "a": 0, "b": 3.14159, "tol": 1e-9}
+    {"id": 3, "expression": "x**3 - 81", "method": "newton_raphson", "x_2": 5, "tolerance": 1e-9}
+
+newton_raphson takes an optional "derivative" expression, newtons_method optional
+"derivative" and "second_derivative" expressions, they are computed by autodiff
+when missing. One JSON result line is written per job as soon as it finishes,
+results of a pool of workers come in the order they finish. With --chunk-size
+above 1, a worker hands back its results once its whole chunk is done.
+
+A job stops with an error once its functions have been called "max_calls" times,
+--max-calls by default, so a margin that can never be met does not stall the run.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import sys
+
+import numpy as np
+
+from algorithms import Algorithms, CountedFunction
+from autodiff import derivatives
+from expression import get_function
+
+# Method names of the job files, the Algorithms method they run and the names of its results
+METHODS = {"bisection": ("bisection_algorithm", ("root", "iterations")),
+           "regula_falsi": ("regula_falsi_algorithm", ("root", "iterations")),
+           "illinois": ("illinois_algorithm", ("root", "iterations")),
+           "brent": ("brent_algorithm", ("root", "iterations")),
+           "secant": ("secant_algorithm", ("root", "iterations")),
+           "steffensen": ("steffensen_algorithm", ("root", "iterations")),
+           "newton_raphson": ("newton_raphson", ("root", "iterations")),
+           "simpsons_3rd_rule": ("simpsons_3rd_rule", ("integral",)),
+           "simpsons_8th_rule": ("simpsons_8th_rule", ("integral",)),
+           "trapezoidal_rule": ("trapazoidal_rule", ("integral",)),
+           "gauss_legendre": ("gauss_legendre", ("integral",)),
+           "monte_carlo": ("monte_carlo", ("integral", "error")),
+           "romberg": ("romberg", ("integral", "error")),
+           "adaptive_simpson": ("adaptive_simpson", ("integral", "error")),
+           "gauss_kronrod": ("gauss_kronrod", ("integral", "error")),
+           "golden_section_search": ("golden_section_search", ("optimum", "iterations")),
+           "parabolic_interpolation": ("parabolic_interpolation", ("optimum", "iterations")),
+           "newtons_method": ("newtons_method", ("optimum", "iterations"))}
+
+# Number of jobs handed to a worker at a time
+CHUNK_SIZE = 1
+# Largest number of calls of the functions of a job. Vectorized rules call them once per
+# chunk of nodes, the scalar loops of the root and optimum methods once per iteration
+MAX_CALLS = 1_000_000
+
+algorithms = Algorithms()
+
+
+class CappedFunction(CountedFunction):
+    """Counted function raising RuntimeError once it has been called max_calls times"""
+    def __init__(self, f, max_calls=MAX_CALLS):
+        super().__init__(f)
+        self.max_calls = max_calls
+
+    def __call__(self, x):
+        if self.calls >= self.max_calls:
+            raise RuntimeError(f"Stopped after {self.max_calls} calls of the function without converging")
+        return super().__call__(x)
+
+
+def read_jobs(file, file_format):
+    """Yields the jobs of an open JSONL or CSV file as dicts, numbers of CSV cells are parsed"""
+    if file_format == "csv":
+        for row in csv.DictReader(file):
+            job = {}
+            for key, value in row.items():
+                if value is None or not value.strip():
+                    continue
+                try:
+                    job[key] = json.loads(value)
+                except json.JSONDecodeError:
+                    # Expressions, method and sampling names stay text
+                    job[key] = value
+            yield job
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def solve(job):
+    """Runs one job and returns its results, evaluations counts every call of the functions"""
+    params = dict(job)
+    text, method = params.pop("expression"), params.pop("method")
+    max_calls = int(params.pop("max_calls", MAX_CALLS))
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'")
+    name, fields = METHODS[method]
+    derivative = params.pop("derivative", None)
+    second_derivative = params.pop("second_derivative", None)
+
+    if method == "newton_raphson" and derivative:
+        functions = [get_function(text), get_function(derivative)]
+    elif method == "newton_raphson":
+        name, functions = "newton_raphson_auto", [derivatives(text)]
+    elif method == "newtons_method" and derivative and second_derivative:
+        functions = [get_function(derivative), get_function(second_derivative)]
+    elif method == "newtons_method":
+        name, functions = "newtons_method_auto", [derivatives(text)]
+    else:
+        functions = [get_function(text)]
+    functions = [CappedFunction(function, max_calls) for function in functions]
+
+    answer = getattr(algorithms, name)(*functions, **params)
+    answer = answer if isinstance(answer, tuple) else (answer,)
+    result = dict(zip(fields, answer))
+    result["evaluations"] = sum(function.evaluations for function in functions)
+    return result
+
+
+def run_job(indexed_job):
+    """Returns the result line of a job and whether it failed, errors are reported in the line"""
+    index, job = indexed_job
+    result = {"id": job.pop("id", index)}
+    try:
+        result.update(solve(job))
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return json.dumps(result, default=to_json), "error" in result
+
+
+def to_json(value):
+    """Converts the numpy results json does not know"""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_results(results, output):
+    """Writes every result line as soon as it comes and returns the number of failed jobs"""
+    failed = 0
+    for line, error in results:
+        failed += error
+        output.write(line + "\n")
+        output.flush()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch",
+                                     description="Runs a file of numerical methods jobs without the GUI")
+    parser.add_argument("jobs", help="JSONL or CSV job file, - reads JSONL from stdin")
+    parser.add_argument("-o", "--output", help="file the result lines are written to, defaults to stdout")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"),
+                        help="format of the job file, defaults to its extension")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes, 0 uses every core")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="number of jobs handed to a worker at a time, larger chunks cut the overhead "
+                             "of many small jobs but hold back results until their whole chunk is done")
+    parser.add_argument("--max-calls", type=int, default=MAX_CALLS,
+                        help="calls of the functions after which a job stops, unless it sets max_calls")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or ("csv" if args.jobs.lower().endswith(".csv") else "jsonl")
+    jobs_file = sys.stdin if args.jobs == "-" else open(args.jobs, newline="")
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        # Jobs without an id are named by their position in the file, from 1
+        jobs = ((index, {"max_calls": args.max_calls, **job})
+                for index, job in enumerate(read_jobs(jobs_file, file_format), start=1))
+        if args.workers == 1:
+            failed = write_results(map(run_job, jobs), output)
+        else:
+            with multiprocessing.Pool(args.workers or None) as pool:
+                failed = write_results(pool.imap_unordered(run_job, jobs, chunksize=args.chunk_size), output)
+    finally:
+        if jobs_file is not sys.stdin:
+            jobs_file.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""This module contains the readers of the data files loaded into the tables"""
+import csv
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+# Bytes read from the start of a file to detect its header and delimiter
+SAMPLE_SIZE = 64 * 1024
+# Bytes of lines parsed at a time by load_csv
+CSV_CHUNK_SIZE = 8 * 1024 * 1024
+# Delimiters recognised by sniff_csv
+DELIMITERS = ",;\t| "
+
+
+def is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def sniff_csv(path):
+    """Detects the delimiter and the header of a csv file from a sample of its first lines
+    Parameters
+    ----------
+    path: str, path of the csv file
+    Returns
+    -------
+    The delimiter, None for runs of whitespace, and the column names, None when the file
+    has no header
+    """
+    with open(path, newline="") as file:
+        sample = file.read(SAMPLE_SIZE)
+    # The last line of the sample may be cut
+    lines = sample.splitlines()[:-1] or sample.splitlines()
+    if not lines:
+        raise ValueError(f"{os.path.basename(path)} is empty")
+
+    try:
+        delimiter = csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # A single column
+        delimiter = ","
+    delimiter = None if delimiter == " " else delimiter
+
+    first_row = next(csv.reader(lines[:1], delimiter=delimiter or " ", skipinitialspace=True))
+    first_row = [field.strip() for field in first_row if field.strip() or delimiter]
+    header = None if all(is_number(field) for field in first_row) else first_row
+    return delimiter, header
+
+
+def load_csv(path, progress=None, chunk_size=CSV_CHUNK_SIZE):
+    """Parses a csv file of numbers into float64 columns, one per field
+
+    The delimiter and header are detected by sniff_csv, the rows are then parsed
+    chunk_size bytes at a time by np.loadtxt.
+    Parameters
+    ----------
+    path: str, path of the csv file
+    progress: callable, optional, called with the number of bytes of every chunk parsed,
+              it may raise to stop the loading
+    chunk_size: int, bytes of lines parsed at a time
+    Returns
+    -------
+    The columns, views of one 2D float64 array, and their names
+    """
+    delimiter, header = sniff_csv(path)
+    chunks = []
+    with open(path, newline="") as file:
+        if header is not None:
+            line = file.readline()
+            if progress is not None:
+                progress(len(line))
+        while lines := file.readlines(chunk_size):
+            chunks.append(np.loadtxt(lines, delimiter=delimiter, dtype=float, ndmin=2, quotechar='"'))
+            if progress is not None:
+                progress(sum(map(len, lines)))
+
+    data = np.concatenate(chunks) if chunks else np.empty((0, len(header or ())))
+    if header is None:
+        header = [f"column {i + 1}" for i in range(data.shape[1])]
+    return list(data.T), header
+
+
+def load_npy(path):
+    """Opens a .npy file of a 2D array, one column per field, as a read-only memory map
+    Parameters
+    ----------
+    path: str, path of the .npy file
+    Returns
+    -------
+    The columns, views of the memory map when the file holds float64, and their names
+    """
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 2:
+        raise ValueError(f"{os.path.basename(path)} holds a {data.ndim}D array, the table needs a 2D array")
+    columns = [data[:, i] if data.dtype == np.float64 else data[:, i].astype(float) for i in range(data.shape[1])]
+    return columns, [f"column {i + 1}" for i in range(data.shape[1])]
+
+
+def map_npz_member(path, archive, name):
+    """Returns the member name of the open .npz archive as a read-only memory map of path,
+    or None when it is compressed"""
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as file:
+        # The member starts after its local header, whose name and extra field lengths
+        # may differ from the central directory
+        file.seek(info.header_offset)
+        local_header = file.read(30)
+        if local_header[:4] != b"PK\x03\x04":
+            return None
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) \
+            else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(file)
+        offset = file.tell()
+    if dtype.hasobject:
+        return None
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def load_npz(path):
+    """Opens the arrays of a .npz file as table columns
+
+    The archive holds either 1D members of the same length, one column each, or a single
+    2D member. Uncompressed members, as written by np.savez and save_data, are memory
+    mapped read-only, compressed ones are read into memory.
+    Parameters
+    ----------
+    path: str, path of the .npz file
+    Returns
+    -------
+    The columns and their names
+    """
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if name.endswith(".npy")]
+        arrays = []
+        for name in names:
+            array = map_npz_member(path, archive, name)
+            if array is None:
+                with archive.open(name) as member:
+                    array = np.lib.format.read_array(member)
+            arrays.append(array)
+    names = [name[:-len(".npy")] for name in names]
+
+    if len(arrays) == 1 and arrays[0].ndim == 2:
+        columns = [arrays[0][:, i] for i in range(arrays[0].shape[1])]
+        names = [f"{names[0]} {i + 1}" for i in range(len(columns))]
+    elif arrays and all(array.ndim == 1 and len(array) == len(arrays[0]) for array in arrays):
+        columns = arrays
+    else:
+        raise ValueError(f"{os.path.basename(path)} needs 1D arrays of the same length or a single 2D array")
+    return [column if column.dtype == np.float64 else column.astype(float) for column in columns], names
+
+
+def save_data(path, x, y, names=("x", "y")):
+    """Writes the x and y columns to a .npy file as an (n, 2) array, to an uncompressed
+    .npz file as members named after names, which load_npz memory maps back, or to a
+    .csv file with names as its header"""
+    if path.lower().endswith(".npz"):
+        np.savez(path, **dict(zip(names, (x, y))))
+    elif path.lower().endswith(".csv"):
+        np.savetxt(path, np.column_stack((x, y)), delimiter=",", header=",".join(names), comments="")
+    else:
+        np.save(path, np.column_stack((x, y)))
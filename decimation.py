@@ -0,0 +1,148 @@
+"""This module contains the decimation stage that reduces large series to about the pixel width of a plot"""
+import numpy as np
+
+# A series is only decimated when it has more points than this many per pixel
+POINTS_PER_PIXEL = 2
+# Largest number of points scanned at a time, so memory mapped series are never copied whole
+CHUNK_SIZE = 2 ** 20
+
+
+def chunks(size, chunk_size=CHUNK_SIZE, overlap=0):
+    """Yields the slices of range(size) scanned at a time, each sharing overlap points with the next"""
+    for start in range(0, max(size - overlap, 1), chunk_size):
+        yield slice(start, min(start + chunk_size + overlap, size))
+
+
+def is_sorted(x):
+    """Returns True if x never decreases, the series then supports clipping and x buckets"""
+    return all(np.all(x[part][1:] >= x[part][:-1]) for part in chunks(x.size, overlap=1))
+
+
+def finite_range(a):
+    """Returns the smallest and largest finite values of a, or None when it has none"""
+    lower = upper = None
+    for part in chunks(a.size):
+        finite = a[part][np.isfinite(a[part])]
+        if finite.size:
+            lower = finite.min() if lower is None else min(lower, finite.min())
+            upper = finite.max() if upper is None else max(upper, finite.max())
+    return None if lower is None else (float(lower), float(upper))
+
+
+def visible_slice(x, lower, upper):
+    """Returns the slice of the sorted x inside [lower, upper], with one more point on each
+    side so the line still reaches the edges of the axes"""
+    start = max(np.searchsorted(x, lower, side="left") - 1, 0)
+    stop = min(np.searchsorted(x, upper, side="right") + 1, x.size)
+    return slice(start, stop)
+
+
+def bucket_starts(x, buckets, sorted_x):
+    """Returns the index of the first point of every non-empty bucket
+
+    Buckets are equal ranges of x when x is sorted, so each one covers about a pixel,
+    else equal numbers of points.
+    """
+    if sorted_x and x[-1] > x[0]:
+        edges = np.linspace(x[0], x[-1], buckets + 1)[:-1]
+        starts = np.searchsorted(x, edges, side="left")
+    else:
+        starts = np.linspace(0, x.size, buckets + 1).astype(int)[:-1]
+    return np.unique(starts)
+
+
+def minmax(x, y, buckets, sorted_x=True):
+    """Keeps the first, the smallest and the largest point of every bucket in their original order
+
+    Peaks survive at any zoom level, at most 3 * buckets points are returned.
+    Parameters
+    ----------
+    x, y : ndarray, the series
+    buckets : int, number of buckets, about the pixel width of the axes
+    sorted_x : bool, whether x never decreases, see bucket_starts
+    Returns
+    -------
+    The decimated x and y
+    """
+    starts = bucket_starts(x, buckets, sorted_x)
+    stops = np.append(starts[1:], x.size)
+    kept = [starts, [x.size - 1]]
+
+    # Groups of whole buckets of about CHUNK_SIZE points
+    group = 0
+    while group < starts.size:
+        last = max(np.searchsorted(stops, starts[group] + CHUNK_SIZE, side="right"), group + 1)
+        offset = starts[group]
+        local_starts = starts[group:last] - offset
+        part = y[offset:stops[last - 1]]
+        counts = np.diff(np.append(local_starts, part.size))
+        bucket = np.repeat(np.arange(local_starts.size), counts)
+
+        # NaNs are ignored by fmin and fmax, a bucket of NaNs keeps only its first point
+        for reduce in (np.fmin, np.fmax):
+            extreme = np.repeat(reduce.reduceat(part, local_starts), counts)
+            hits = np.flatnonzero(part == extreme)
+            # The first hit of every bucket
+            _, first = np.unique(bucket[hits], return_index=True)
+            kept.append(hits[first] + offset)
+        group = last
+
+    keep = np.unique(np.concatenate(kept).astype(int))
+    return x[keep], y[keep]
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling of the series to threshold points
+
+    The first and last points are kept, every bucket in between keeps the point forming
+    the largest triangle with the point kept before it and the mean of the next bucket.
+    Parameters
+    ----------
+    x, y : ndarray, the series
+    threshold : int, number of points returned
+    Returns
+    -------
+    The decimated x and y
+    """
+    if threshold >= x.size or threshold < 3:
+        return x, y
+
+    edges = np.linspace(1, x.size - 1, threshold - 1).astype(int)
+    # Means of every bucket, used as the third vertex of the triangles of the bucket before
+    sums_x, sums_y = np.add.reduceat(x[1:-1], edges[:-1] - 1), np.add.reduceat(y[1:-1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    mean_x = np.append(sums_x / sizes, x[-1])
+    mean_y = np.append(sums_y / sizes, y[-1])
+
+    chosen = np.empty(threshold, dtype=int)
+    chosen[0], chosen[-1] = 0, x.size - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the area of the triangles, previous point, candidate and next mean
+        area = np.abs((x[previous] - mean_x[i + 1]) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (mean_y[i + 1] - y[previous]))
+        previous = chosen[i + 1] = start + np.nanargmax(area) if np.isfinite(area).any() else start
+    return x[chosen], y[chosen]
+
+
+def decimate(x, y, pixels, method="minmax", sorted_x=True):
+    """Reduces the series to about pixels points, or returns it as it is when already small
+    Parameters
+    ----------
+    x, y : ndarray, the series
+    pixels : int, width of the axes in pixels
+    method : str, "minmax" keeps every peak, "lttb" keeps the visual shape with fewer points
+    sorted_x : bool, whether x never decreases, see bucket_starts
+    Returns
+    -------
+    The decimated x and y
+    """
+    pixels = max(int(pixels), 2)
+    if x.size <= POINTS_PER_PIXEL * pixels:
+        return x, y
+    if method == "minmax":
+        return minmax(x, y, pixels, sorted_x)
+    if method == "lttb":
+        return lttb(x, y, POINTS_PER_PIXEL * pixels)
+    raise ValueError(f"Unknown decimation method '{method}'")
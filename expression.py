@@ -0,0 +1,323 @@
+"""This module contains the expression subsystem that turns the functions typed into the tabs into callables"""
+import ast
+from collections import OrderedDict
+
+import numpy as np
+
+# Names a user expression is allowed to reference besides its variable
+NAMESPACE = {"sin": np.sin, "cos": np.cos, "tan": np.tan,
+             "sqrt": np.sqrt, "exp": np.exp, "log": np.log,
+             "arange": np.arange, "abs": np.abs, "pi": np.pi, "e": np.e}
+
+# Syntax nodes a user expression may be built from
+ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name,
+                 ast.Load, ast.Constant, ast.operator, ast.unaryop)
+
+
+def parse_expression(text, variable="x", namespace=NAMESPACE):
+    """Parses and validates a user expression
+    Parameters
+    ----------
+    text: str, expression in python syntax, Eg: x**2 - 4*x
+    variable: str, name of the independent variable
+    namespace: dict, functions and constants the expression may use
+    Returns
+    -------
+    The ast.Expression tree of text
+    """
+    text = text.strip()
+    if not text:
+        raise SyntaxError("Function field is empty")
+    tree = ast.parse(text, mode="eval")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise SyntaxError(f"'{type(node).__name__}' is not allowed in a function")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)):
+            raise SyntaxError("Only plain calls such as sin(x) are allowed in a function")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise SyntaxError(f"{node.value!r} is not a number")
+        if isinstance(node, ast.Name) and node.id != variable and node.id not in namespace:
+            raise NameError(f"name '{node.id}' is not defined")
+    return tree
+
+
+# Smallest float64 array evaluated into preallocated buffers instead of plain expressions
+ARRAY_THRESHOLD = 4096
+
+# Python operators of the expression syntax and the ufuncs computing them on arrays
+OPERATORS = {ast.Add: ("+", np.add), ast.Sub: ("-", np.subtract), ast.Mult: ("*", np.multiply),
+             ast.Div: ("/", np.true_divide), ast.FloorDiv: ("//", np.floor_divide),
+             ast.Mod: ("%", np.remainder), ast.Pow: ("**", np.power), ast.USub: ("-", np.negative)}
+
+
+class ConstantFolder(ast.NodeTransformer):
+    """Replaces every subexpression that does not depend on the variable by its value
+
+    Python numbers become constant nodes. NumPy scalars, such as the result of tan(pi),
+    become names bound in constants, so they keep their NumPy arithmetic: a negative
+    float64 to the power 0.5 is nan instead of a complex number, and a division by a
+    float64 zero is inf instead of a ZeroDivisionError.
+    """
+    def __init__(self, variable, namespace):
+        self.variable = variable
+        self.namespace = namespace
+        self.constants = {}
+
+    def is_constant(self, node):
+        return isinstance(node, ast.Constant) or (isinstance(node, ast.Name) and node.id in self.constants)
+
+    def value(self, node):
+        return node.value if isinstance(node, ast.Constant) else self.constants[node.id]
+
+    def visit_Name(self, node):
+        if node.id != self.variable and node.id not in self.constants and not callable(self.namespace[node.id]):
+            # Constants such as pi
+            return self.fold(node)
+        return node
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if self.is_constant(node.left) and self.is_constant(node.right):
+            if isinstance(node.op, ast.Pow) and abs(self.value(node.right)) > 64:
+                # Huge integer powers are left to run time
+                return node
+            return self.fold(node)
+        return node
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if self.is_constant(node.operand):
+            return self.fold(node)
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if all(self.is_constant(arg) for arg in node.args):
+            return self.fold(node)
+        return node
+
+    def fold(self, node):
+        """Returns a node holding the value of node, or node if it can not be computed"""
+        code = compile(ast.fix_missing_locations(ast.Expression(body=node)), "<expression>", "eval")
+        try:
+            with np.errstate(all="ignore"):
+                value = eval(code, {"__builtins__": {}, **self.namespace, **self.constants})
+        except (ArithmeticError, TypeError, ValueError):
+            # Raised again when the function is called
+            return node
+        if isinstance(value, np.generic) and np.ndim(value) == 0 and np.issubdtype(type(value), np.number):
+            name = f"_k{len(self.constants)}"
+            self.constants[name] = value
+            return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+        if not isinstance(value, (int, float, complex)):
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+
+def linearize(tree, variable, constants=None):
+    """Turns an expression tree into straight-line instructions, one per distinct subexpression
+
+    Names other than variable are looked up in constants, the NumPy scalars of ConstantFolder.
+    Returns
+    -------
+    The list of (operation, operands) instructions in evaluation order and the operand
+    holding the result. An operand is ("var",), ("const", value) or ("temp", index)
+    """
+    instructions, index = [], {}
+
+    def visit(node):
+        if isinstance(node, ast.Name):
+            return ("var",) if node.id == variable else ("const", constants[node.id])
+        if isinstance(node, ast.Constant):
+            return ("const", node.value)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.UAdd):
+            return visit(node.operand)
+
+        # Common subexpressions are computed once
+        key = ast.dump(node)
+        if key not in index:
+            if isinstance(node, ast.BinOp):
+                operation, operands = type(node.op), [visit(node.left), visit(node.right)]
+            elif isinstance(node, ast.UnaryOp):
+                operation, operands = type(node.op), [visit(node.operand)]
+            else:
+                operation, operands = node.func.id, [visit(arg) for arg in node.args]
+            if isinstance(operation, type) and operation not in OPERATORS:
+                raise SyntaxError(f"'{operation.__name__}' is not allowed in a function, use ** for powers")
+            index[key] = len(instructions)
+            instructions.append((operation, operands))
+        return ("temp", index[key])
+
+    return instructions, visit(tree.body)
+
+
+def generate_source(instructions, result, variable, namespace):
+    """Writes the python source of the straight-line function computing the instructions
+
+    Scalars, and arrays smaller than ARRAY_THRESHOLD, go through plain python expressions.
+    Large float64 arrays go through ufunc calls whose out= buffers are reused as soon
+    as the temporary they hold is no longer needed.
+    """
+    constants = {}
+
+    def render(operand, names):
+        if operand[0] == "var":
+            return variable
+        if operand[0] == "temp":
+            return names[operand[1]]
+        value = operand[1]
+        if isinstance(value, np.generic):
+            # NumPy scalars are bound by name so they keep their type
+            return constants.setdefault(repr(value), (f"_c{len(constants)}", value))[0]
+        if isinstance(value, complex):
+            return f"({value!r})"
+        if not np.isfinite(value):
+            # inf and nan have no literal
+            return constants.setdefault(repr(value), (f"_c{len(constants)}", value))[0]
+        return repr(value) if value >= 0 else f"({value!r})"
+
+    # Plain expressions, valid for floats, small arrays and Dual numbers
+    names = [f"_t{i}" for i in range(len(instructions))]
+    scalar_lines = []
+    for i, (operation, operands) in enumerate(instructions):
+        args = [render(operand, names) for operand in operands]
+        if isinstance(operation, str):
+            line = f"{operation}({', '.join(args)})"
+        elif len(args) == 1:
+            line = f"{OPERATORS[operation][0]}{args[0]}"
+        else:
+            line = f"{args[0]} {OPERATORS[operation][0]} {args[1]}"
+        scalar_lines.append(f"    {names[i]} = {line}")
+    scalar_lines.append(f"    return {render(result, names)}")
+
+    # The array path needs ufuncs for every call and real constants only
+    vectorizable = all(isinstance(namespace[operation], np.ufunc) for operation, _ in instructions
+                       if isinstance(operation, str))
+    vectorizable &= not any(isinstance(operand[1], complex) for _, operands in instructions
+                            for operand in operands if operand[0] == "const")
+    if not instructions or not vectorizable:
+        return "\n".join([f"def _function({variable}):"] + scalar_lines), constants
+
+    # Temporaries that depend on the variable are arrays, the others are scalars
+    depends = []
+    last_use = [len(instructions)] * len(instructions)
+    for i, (_, operands) in enumerate(instructions):
+        depends.append(any(operand[0] == "var" or (operand[0] == "temp" and depends[operand[1]])
+                           for operand in operands))
+        for operand in operands:
+            if operand[0] == "temp":
+                last_use[operand[1]] = i
+    if result[0] == "temp":
+        last_use[result[1]] = len(instructions) + 1
+
+    names = list(names)
+    free_buffers, buffer_count = [], 0
+    array_lines = []
+    for i, (operation, operands) in enumerate(instructions):
+        args = [render(operand, names) for operand in operands]
+        if not depends[i]:
+            array_lines.append(scalar_lines[i])
+            continue
+
+        # Buffers of array temporaries used for the last time here
+        dying = [names[operand[1]] for operand in operands
+                 if operand[0] == "temp" and depends[operand[1]] and last_use[operand[1]] == i]
+        dying = list(dict.fromkeys(dying))
+        fresh = False
+        if dying:
+            out = dying.pop(0)
+        elif free_buffers:
+            out = free_buffers.pop()
+        else:
+            out, fresh = f"_b{buffer_count}", True
+            buffer_count += 1
+
+        if isinstance(operation, str):
+            ufunc = operation
+        elif operation is ast.Pow and operands[1] == ("const", 2):
+            ufunc, args = "_square", args[:1]
+        elif operation is ast.Pow and operands[1] == ("const", 0.5):
+            ufunc, args = "_sqrt", args[:1]
+        else:
+            ufunc = f"_{OPERATORS[operation][1].__name__}"
+        if fresh:
+            array_lines.append(f"        {out} = {ufunc}({', '.join(args)})")
+        else:
+            array_lines.append(f"        {ufunc}({', '.join(args)}, out={out})")
+        names[i] = out
+        free_buffers.extend(dying)
+    array_lines.append(f"        return {render(result, names)}")
+    array_lines = [line if line.startswith("        ") else "    " + line for line in array_lines]
+
+    source = [f"def _function({variable}):",
+              f"    if _isinstance({variable}, _ndarray) and {variable}.dtype == _float64 "
+              f"and {variable}.size >= {ARRAY_THRESHOLD}:"]
+    return "\n".join(source + array_lines + scalar_lines), constants
+
+
+def compile_expression(text, variable="x", namespace=NAMESPACE):
+    """Compiles a user expression once into a python function of one variable
+
+    Constant subexpressions are folded, common subexpressions are computed once and
+    large arrays are evaluated into reused buffers, see generate_source.
+    Parameters
+    ----------
+    text: str, expression in python syntax, Eg: x**2 - 4*x
+    variable: str, name of the independent variable
+    namespace: dict, functions and constants the expression may use
+    Returns
+    -------
+    A callable f, where f(x) evaluates text at x
+    """
+    folder = ConstantFolder(variable, namespace)
+    tree = folder.visit(parse_expression(text, variable, namespace))
+    instructions, result = linearize(tree, variable, folder.constants)
+    source, constants = generate_source(instructions, result, variable, namespace)
+
+    scope = {"__builtins__": {}, **namespace, "_isinstance": isinstance, "_ndarray": np.ndarray, "_float64": np.float64,
+             "_square": np.square, "_sqrt": np.sqrt, **dict(constants.values())}
+    scope.update({f"_{ufunc.__name__}": ufunc for _, ufunc in OPERATORS.values()})
+    exec(compile(source, "<expression>", "exec"), scope)
+    function = scope["_function"]
+    function.source = source
+    return function
+
+
+class ExpressionCache:
+    """Bounded least-recently-used cache of compiled expressions keyed by their text"""
+    def __init__(self, maxsize=128, namespace=NAMESPACE):
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self._functions = OrderedDict()
+
+    def __len__(self):
+        return len(self._functions)
+
+    def get(self, text, variable="x"):
+        """Returns the compiled callable of text, compiling it on a cache miss"""
+        key = (text.strip(), variable)
+        try:
+            self._functions.move_to_end(key)
+            return self._functions[key]
+        except KeyError:
+            pass
+
+        function = compile_expression(text, variable, self.namespace)
+        self._functions[key] = function
+        if len(self._functions) > self.maxsize:
+            # Evicts the least recently used expression
+            self._functions.popitem(last=False)
+        return function
+
+    def clear(self):
+        self._functions.clear()
+
+
+# Cache shared by every tab
+expression_cache = ExpressionCache()
+
+
+def get_function(text, variable="x"):
+    """Returns the compiled callable of text from the shared cache"""
+    return expression_cache.get(text, variable)
@@ -5,13 +5,21 @@ from PyQt6.QtWidgets import (QLabel, QTableWidget, QWidget,
                             QTableView)
                             
 from PyQt6.QtCore import Qt, QRegularExpression
-from PyQt6.QtGui import QStandardItem, QStandardItemModel, QRegularExpressionValidator
-from numpy import tan, cos, sin, sqrt, arange
-import csv
+from PyQt6.QtGui import QRegularExpressionValidator
+from numpy import arange, asarray, concatenate, empty, searchsorted, sort
 import matplotlib
 matplotlib.use("Qt5Agg")
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
 from matplotlib.figure import Figure
+from expression import get_function
+from workers import JobRunner, showError
+from decimation import chunks, decimate, finite_range, is_sorted, visible_slice
+from sampling import adaptive_sample
+from datafiles import save_data
+from tablemodel import ArrayTableModel, loadTableData
+
+# Largest number of root markers drawn on the canvas
+MAX_ROOT_MARKERS = 1_000
 
 class CreateCanvas(FigureCanvasQTAgg):
     def __init__(self, parent = None, nrows = 1, ncols = 1):
@@ -52,6 +60,10 @@ class PlotGraph(QWidget):
         x_data.addWidget(self.x_upper)
         x_data.addWidget(QLabel("step:"))
         x_data.addWidget(self.step_size)
+        # Adaptive sampling replaces the uniform step
+        self.adaptive = QCheckBox("Adaptive")
+        self.adaptive.clicked.connect(self.step_size.setDisabled)
+        x_data.addWidget(self.adaptive)
 
         # Adds func_form and x_data layouts to a QVBoxLayout
         func_data_layout = QVBoxLayout()
@@ -64,9 +76,7 @@ class PlotGraph(QWidget):
         func_data_grpbox.setLayout(func_data_layout)
 
         # Creates a table model, tableview widget, QPushButton and its layout
-        self.table_model = QStandardItemModel()
-        self.table_model.setRowCount(200)
-        self.table_model.setColumnCount(2)
+        self.table_model = ArrayTableModel(200, 2)
         
         self.table = QTableView()
         self.table.horizontalHeader().setStretchLastSection(True)
@@ -77,11 +87,14 @@ class PlotGraph(QWidget):
         self.enable_table = QCheckBox("Enable")
         self.enable_table.clicked.connect(self.enableTable)
         self.load_data = QPushButton("Load Data")
-        self.load_data.clicked.connect(self.loadCSV)
+        self.load_data.clicked.connect(self.loadData)
+        self.save_data = QPushButton("Save Data")
+        self.save_data.clicked.connect(self.saveData)
 
         buttons_layout = QHBoxLayout()
         buttons_layout.addWidget(self.enable_table)
         buttons_layout.addWidget(self.load_data)
+        buttons_layout.addWidget(self.save_data)
 
         table_layout = QVBoxLayout()
         table_layout.addWidget(self.table)
@@ -103,14 +116,23 @@ class PlotGraph(QWidget):
 
         self.plot_func = QPushButton("Plot")
         self.plot_func.clicked.connect(self.plotFunc)
+        self.runner = JobRunner()
+        self.runner.busy.connect(self.plot_func.setDisabled)
+        self.runner.busy.connect(self.load_data.setDisabled)
+        self.runner.busy.connect(self.save_data.setDisabled)
         # Creates an instance of the CreateCanvas, NavigationToolbar2QT class and layouts
         self.canvas = CreateCanvas()
         navigation_toolbar = NavigationToolbar2QT(self.canvas)
+        self.createArtists()
+        self.mark_roots = QCheckBox("Mark roots")
+        self.mark_roots.clicked.connect(self.showRoots)
 
         canvas_layout = QVBoxLayout()
         canvas_layout.addWidget(navigation_toolbar)
         canvas_layout.addWidget(self.canvas)
         canvas_layout.addWidget(self.plot_func)
+        canvas_layout.addWidget(self.mark_roots)
+        canvas_layout.addWidget(self.runner)
         
         # Sets the canvas_layout to a groupbox
         canvas_groupbox = QGroupBox("Plot Area")
@@ -138,15 +160,24 @@ class PlotGraph(QWidget):
     def getFuncData(self):
         """Gets data from the QlinEdits in the function data groupbox"""
         # Gets function data
-        function = lambda x: eval(self.func_edit.text())
+        function = get_function(self.func_edit.text())
         x_lower_num = float(self.x_lower.text())
         x_upper_num = float(self.x_upper.text())
+        if self.adaptive.isChecked():
+            # The x axis data is chosen by the adaptive sampler
+            return function, x_lower_num, x_upper_num, None
         x_step_num = float(self.step_size.text())
 
-        # variables to hold x and y axis data
+        # x axis data, the y axis data is computed by plotFunc's job
         x_values = arange(x_lower_num, x_upper_num + x_step_num, x_step_num)
-        y_values = function(x_values)
-        return x_values, y_values
+        return function, x_lower_num, x_upper_num, x_values
+
+    def functionDataJob(self, function, x_lower_num, x_upper_num, x_values):
+        """Returns the job computing the x and y data of the function from getFuncData"""
+        if x_values is None:
+            width, height = self.canvas.axes.bbox.width, self.canvas.axes.bbox.height
+            return lambda monitor: adaptive_sample(monitor(function), x_lower_num, x_upper_num, width, height)[:2]
+        return lambda monitor: (x_values, monitor(function)(x_values))
 
     def enableTable(self, state):
         """Enables the table or function data groupbox widgets based on the state of the enable checkbox"""
@@ -162,29 +193,139 @@ class PlotGraph(QWidget):
 
     def getTableData(self):
         """Gets table data about the function to be plotted"""
-        # List to hold x and y axis data
-        list_x, list_y = [], []
-        for index in range(self.table_model.rowCount()):
-            item_x = self.table_model.item(index , 0)
-            item_y = self.table_model.item(index, 1)
-
-            if item_x and item_y:
-                list_x.append(float(item_x.text()))
-                list_y.append(float(item_y.text()))
-
-        return list_x, list_y
+        # Views of the x and y columns over the rows where both are set
+        return self.table_model.filled(0, 1)
+
+    def createArtists(self):
+        """Creates the line and the overlays kept on the canvas for every plot
+
+        The overlays, the cursor readout and the root markers, are animated artists
+        blitted over a saved background instead of redrawing the figure.
+        """
+        axes = self.canvas.axes
+        self.line, = axes.plot([], [], color="green")
+        self.root_markers, = axes.plot([], [], "o", color="red", visible=False, animated=True)
+        self.cursor_line = axes.axvline(0, color="gray", linewidth=0.8, visible=False, animated=True)
+        self.cursor_text = axes.text(0.02, 0.97, "", transform=axes.transAxes, verticalalignment="top",
+                                     animated=True)
+        self.overlays = [self.root_markers, self.cursor_line, self.cursor_text]
+
+        self.full_x = self.full_y = empty(0)
+        self.sorted_x = True
+        self.data_limits = None
+        self.background = None
+        axes.callbacks.connect("xlim_changed", self.redecimate)
+        self.canvas.mpl_connect("draw_event", self.saveBackground)
+        self.canvas.mpl_connect("motion_notify_event", self.moveCursor)
 
     def drawOnCanvas(self, x, y):
         """Embeds a matplotlib plot figure onto the canvas"""
-        # Clears the canvas and embeds a plot figure on it
-        self.canvas.fig.clear()
-        self.canvas.add_subplot()
-        self.canvas.axes.plot(x, y, color="green")
-        self.canvas.draw()
+        # Full resolution data, the line only holds about one point per pixel of it.
+        # Memory mapped data is only scanned in chunks, never copied whole
+        self.full_x, self.full_y = asarray(x, dtype=float), asarray(y, dtype=float)
+        self.sorted_x = is_sorted(self.full_x)
+
+        # Rescales only when the ranges of the data change, else the current view is kept
+        limits = (finite_range(self.full_x), finite_range(self.full_y))
+        rescale = limits != self.data_limits
+        self.data_limits = limits
+
+        # Updates the existing artists
+        self.line.set_data(*self.decimateData(None if rescale else self.canvas.axes.get_xlim()))
+        self.root_markers.set_data(*self.findRoots())
+        if rescale:
+            # Only the line sets the limits, the overlays are hidden while they are computed
+            shown = [artist for artist in (self.root_markers, self.cursor_line) if artist.get_visible()]
+            for artist in shown:
+                artist.set_visible(False)
+            self.canvas.axes.relim(visible_only=True)
+            self.canvas.axes.autoscale()
+            for artist in shown:
+                artist.set_visible(True)
+        self.canvas.draw_idle()
+
+    def findRoots(self):
+        """Returns the points where the full resolution data crosses zero, interpolated linearly"""
+        roots, found = [], 0
+        for part in chunks(self.full_x.size, overlap=1):
+            x, y = self.full_x[part], self.full_y[part]
+            crossing = (y[:-1] * y[1:] < 0).nonzero()[0]
+            roots.append(x[crossing] - y[crossing] * (x[crossing + 1] - x[crossing])
+                         / (y[crossing + 1] - y[crossing]))
+            # The last point of a chunk is the first of the next one
+            roots.append(x[:-1][y[:-1] == 0] if part.stop < self.full_x.size else x[y == 0])
+            found += roots[-1].size + roots[-2].size
+            if found >= MAX_ROOT_MARKERS:
+                break
+        roots = sort(concatenate(roots))[:MAX_ROOT_MARKERS]
+        return roots, roots * 0
+
+    def showRoots(self, state):
+        """Shows or hides the root markers"""
+        self.root_markers.set_visible(state)
+        self.blitOverlays()
+
+    def saveBackground(self, event):
+        """Keeps the freshly drawn figure without the overlays, then draws them over it"""
+        self.background = self.canvas.copy_from_bbox(self.canvas.axes.bbox)
+        # The canvas paints its buffer after this event, so blitting here would repaint recursively
+        self.drawOverlays(blit=False)
+
+    def drawOverlays(self, blit=True):
+        for artist in self.overlays:
+            self.canvas.axes.draw_artist(artist)
+        if blit:
+            self.canvas.blit(self.canvas.axes.bbox)
+
+    def blitOverlays(self):
+        """Redraws only the overlays over the saved background"""
+        if self.background is not None:
+            self.canvas.restore_region(self.background)
+            self.drawOverlays()
+
+    def moveCursor(self, event):
+        """Shows the data point nearest to the mouse in the cursor readout"""
+        if event.inaxes is not self.canvas.axes or not self.full_x.size:
+            if not self.cursor_line.get_visible():
+                return
+            self.cursor_line.set_visible(False)
+            self.cursor_text.set_text("")
+        else:
+            x, y = self.full_x, self.full_y
+            if self.sorted_x:
+                i = min(searchsorted(x, event.xdata), x.size - 1)
+                i = i - 1 if i > 0 and event.xdata - x[i - 1] < x[i] - event.xdata else i
+            else:
+                i = abs(x - event.xdata).argmin()
+            self.cursor_line.set_xdata([x[i], x[i]])
+            self.cursor_line.set_visible(True)
+            self.cursor_text.set_text(f"x = {x[i]:.6g}, f(x) = {y[i]:.6g}")
+        self.blitOverlays()
+
+    def decimateData(self, limits=None):
+        """Returns the full resolution data reduced to the pixel width of the axes, within
+        the x limits when given and the data is sorted"""
+        x, y = self.full_x, self.full_y
+        if limits is not None and self.sorted_x:
+            visible = visible_slice(x, *limits)
+            x, y = x[visible], y[visible]
+        return decimate(x, y, self.canvas.axes.bbox.width, sorted_x=self.sorted_x)
+
+    def redecimate(self, axes):
+        """Decimates the full resolution data again for the new view after a zoom or a pan"""
+        if self.sorted_x:
+            self.line.set_data(*self.decimateData(axes.get_xlim()))
+            self.canvas.draw_idle()
+
+    def showPlot(self, x, y):
+        """Keeps and draws the data computed by plotFunc's job"""
+        self.x_values, self.y_values = x, y
+        self.drawOnCanvas(x, y)
 
     def checkForEmptyFields(self, function, *args):
         """Returns a warning message if empty fields exist else, calls a function"""
-        if not all((self.func_edit.text(), self.x_upper.text(), self.x_lower.text(), self.step_size.text())):
+        step = self.adaptive.isChecked() or self.step_size.text()
+        if not all((self.func_edit.text(), self.x_upper.text(), self.x_lower.text(), step)):
             QMessageBox.warning(self, "Empty Fields",
                                 "Empty Fields exist in function data, ensure required data is entered in every field.",
                                 QMessageBox.StandardButton.Ok)
@@ -203,8 +344,7 @@ class PlotGraph(QWidget):
             else:
                 plot_data = self.checkForEmptyFields(self.getFuncData)
                 if plot_data:
-                    self.x_values, self.y_values = plot_data
-                    self.drawOnCanvas(self.x_values, self.y_values)
+                    self.runner.start(self.functionDataJob(*plot_data), lambda result: self.showPlot(*result))
 
         except SyntaxError as error:
             QMessageBox.warning(self, "Syntax Error",
@@ -228,18 +368,27 @@ class PlotGraph(QWidget):
             QMessageBox.warning(self, "Name Error",
                                 f"{error}", QMessageBox.StandardButton.Ok)
     
-    def loadCSV(self):
-        """Loads csv data into the table widget"""
+    def loadData(self):
+        """Loads csv, npy or npz data into the table widget"""
         if self.enable_table.isChecked():
-            file_name, _ = QFileDialog.getOpenFileName(self, "Open file",".","CSV file(*.csv)")
-            if file_name:
-                self.table_model.clear()
-                with open(file_name, "r") as file:
-                    csv_file = csv.reader(file)
-                    self.table_model.setHorizontalHeaderLabels(next(csv_file))
-
-                    for index, items in enumerate(csv.reader(file)):
-                        item = [QStandardItem(i) for i in items]
-                        self.table_model.insertRow(index, item)
+            loadTableData(self, self.runner, self.table_model)
         else:
-            QMessageBox.warning(self,"Error","Table must be enabled to load csv file",QMessageBox.StandardButton.Ok)
\ No newline at end of file
+            QMessageBox.warning(self,"Error","Table must be enabled to load data",QMessageBox.StandardButton.Ok)
+
+    def saveData(self):
+        """Saves the table data, or the function data of getFuncData, to a npy, npz or csv file"""
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save file", ".",
+                                                   "NumPy array(*.npy);;NumPy archive(*.npz);;CSV file(*.csv)")
+        if not file_name:
+            return
+        try:
+            if self.enable_table.isChecked():
+                x_values, y_values = self.getTableData()
+                self.runner.start(lambda monitor: save_data(file_name, x_values, y_values), lambda result: None)
+                return
+            plot_data = self.checkForEmptyFields(self.getFuncData)
+            if plot_data:
+                job = self.functionDataJob(*plot_data)
+                self.runner.start(lambda monitor: save_data(file_name, *job(monitor)), lambda result: None)
+        except (SyntaxError, NameError, ValueError) as error:
+            showError(self, error)
@@ -2,20 +2,27 @@
 
 # imports the required widgets
 import os
-from numpy import sin, cos, tan, arange, sqrt
+from numpy import arange, linspace
 from PyQt6.QtWidgets import (QWidget, QPushButton, QRadioButton,
                              QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QGroupBox, QButtonGroup,
                              QCheckBox, QFormLayout, QMessageBox,
-                             QTableView, QHeaderView)
+                             QTableView, QHeaderView, QFileDialog)
 
-from PyQt6.QtGui import QIcon, QRegularExpressionValidator, QStandardItemModel, QStandardItem
-from PyQt6.QtCore import Qt, QSize, QRegularExpression
+from PyQt6.QtGui import QIcon, QRegularExpressionValidator
+from PyQt6.QtCore import Qt, QSize, QRegularExpression, pyqtSignal
 from algorithms import Algorithms
+from expression import get_function
+from workers import JobRunner
+from datafiles import save_data
+from parallel import parallel_rule, parallel_monte_carlo
+from tablemodel import ArrayTableModel, loadTableData
 
 basedir = os.path.dirname(__file__)
 
 class Integration(QWidget):
+    # x values and running integral to plot on the Graph Plotting tab
+    running_integral = pyqtSignal(object, object)
 
     def __init__(self):
         super().__init__()
@@ -32,11 +39,18 @@ class Integration(QWidget):
         self.simp8th_rb = QRadioButton("Simpsons 3/8")
         self.trapezium_rb = QRadioButton("Trapezium")
         self.montecarlo_rb = QRadioButton("Monte Carlo")
+        self.gauss_rb = QRadioButton("Gauss-Legendre")
+        self.adaptive_simps_rb = QRadioButton("Adaptive Simpsons")
+        self.kronrod_rb = QRadioButton("Gauss-Kronrod 7/15")
+        self.romberg_rb = QRadioButton("Romberg")
 
-        self.methods_rb_list = [self.simp8th_rb, self.simps3rd_rb, self.trapezium_rb, self.montecarlo_rb]
+        self.methods_rb_list = [self.simp8th_rb, self.simps3rd_rb, self.trapezium_rb, self.montecarlo_rb, self.gauss_rb,
+                                self.adaptive_simps_rb, self.kronrod_rb, self.romberg_rb]
+        # Methods driven by a tolerance instead of a number of intervals
+        self.adaptive_rb_list = [self.adaptive_simps_rb, self.kronrod_rb, self.romberg_rb]
 
         button_tooltips = []
-        for _ in range(4):
+        for _ in range(len(self.methods_rb_list)):
             buttons = QPushButton()
             buttons.setIcon(QIcon(os.path.join(basedir,"./images/information.png")))
             buttons.setStyleSheet("border-style:solid; border-width:0px")
@@ -80,12 +94,29 @@ class Integration(QWidget):
         self.intervals.setPlaceholderText("Enter number of intervals")
         self.intervals.setClearButtonEnabled(True)
 
+        self.order = QLineEdit()
+        self.order.setPlaceholderText("Gauss-Legendre nodes per interval, Eg: 5")
+        self.order.setClearButtonEnabled(True)
+
+        self.tolerance = QLineEdit()
+        self.tolerance.setPlaceholderText("Tolerance of adaptive methods, Eg: 1e-8")
+        self.tolerance.setClearButtonEnabled(True)
+
+        # Runs the composite rules and Monte Carlo on a process pool
+        self.use_all_cores = QCheckBox("Use all cores")
+        # Integrates up to every x value instead of only the upper limit
+        self.cumulative = QCheckBox("Running integral")
+
         # QFormlayout containing a label and corresponding QlineEdit
         func_data_form = QFormLayout()
         func_data_form.addRow(QLabel("Function:"), self.func_edit)
         func_data_form.addRow(QLabel("Intervals:"), self.intervals)
+        func_data_form.addRow(QLabel("Order:"), self.order)
+        func_data_form.addRow(QLabel("Tolerance:"), self.tolerance)
         func_data_form.addRow(QLabel("Upper-limit:"), self.upper_limit)
         func_data_form.addRow(QLabel("Lower-limit:"), self.lower_limit)
+        func_data_form.addRow(self.use_all_cores)
+        func_data_form.addRow(self.cumulative)
 
         # Sets the func_data_form to a groupbox
         func_data_grpbox = QGroupBox("Function Data")
@@ -97,16 +128,17 @@ class Integration(QWidget):
         self.fill_table.clicked.connect(self.fillTable)
         self.enable_table = QCheckBox("Enable")
         self.enable_table.clicked.connect(lambda state: self.table.setEnabled(state))
+        # Measured data, integrated by the Trapezium and Simpsons 1/3 rules while the table is enabled
+        self.load_data = QPushButton("Load Data")
+        self.load_data.clicked.connect(self.loadData)
 
         chkbx_hbox = QHBoxLayout()
         chkbx_hbox.addWidget(self.fill_table)
         chkbx_hbox.addWidget(self.enable_table)
+        chkbx_hbox.addWidget(self.load_data)
         
-        # Creates a QTableView, QStandardItemModel objects and its layout
-        self.table_model = QStandardItemModel()
-        self.table_model.setRowCount(500)
-        self.table_model.setColumnCount(2)
-        self.table_model.setHorizontalHeaderLabels(["x", "f(x)"])
+        # Creates a QTableView, ArrayTableModel objects and its layout
+        self.table_model = ArrayTableModel(500, 2, ["x", "f(x)"])
 
         self.table = QTableView()
         self.table.horizontalHeader().setStretchLastSection(True)
@@ -124,20 +156,37 @@ class Integration(QWidget):
 
         self.solve_integral = QPushButton("Calculate Integral")
         self.solve_integral.clicked.connect(self.solveIntegral)
+        self.runner = JobRunner()
+        self.runner.busy.connect(self.solve_integral.setDisabled)
+        self.runner.busy.connect(self.load_data.setDisabled)
 
         # Vertical layout for the func_data_grpbox and table_grpbox
         groupbox_layout = QVBoxLayout()
         groupbox_layout.addWidget(func_data_grpbox)
         groupbox_layout.addWidget(table_grpbox)
         groupbox_layout.addWidget(self.solve_integral, stretch= 5)
+        groupbox_layout.addWidget(self.runner)
 
         # Adds the groupbox_layout to the integral_main_hbox layout
         self.integral_main_hbox.addLayout(groupbox_layout)
 
         # Creates the results label and its layout
         self.integral_found = QLabel("")
+        self.error_found = QLabel("")
+        self.evals_found = QLabel("")
         results_form = QFormLayout()
         results_form.addRow(QLabel("Integral:"), self.integral_found)
+        results_form.addRow(QLabel("Error estimate:"), self.error_found)
+        results_form.addRow(QLabel("Evaluations:"), self.evals_found)
+
+        # The running integral is plotted on the Graph Plotting tab or saved to a file
+        self.plot_running = QPushButton("Plot Running Integral")
+        self.plot_running.clicked.connect(self.plotRunningIntegral)
+        self.export_running = QPushButton("Export Running Integral")
+        self.export_running.clicked.connect(self.exportRunningIntegral)
+        for button in (self.plot_running, self.export_running):
+            button.setDisabled(True)
+            results_form.addRow(button)
 
         # Sets the results_form to a groupbox
         results_grpbox = QGroupBox("Results")
@@ -151,6 +200,7 @@ class Integration(QWidget):
         # Adds the results_grpbox to the integral_main_hbox
         self.integral_main_hbox.addLayout(results_layout)
 
+        self.running_x = self.running_y = None
         self.validateFields()
         self.algo = Algorithms()
 
@@ -159,19 +209,27 @@ class Integration(QWidget):
         float_regex = QRegularExpression(r"-?[0-9]+.?[0-9]+")
         expression_regex = QRegularExpression(r"[\s\w 0-9 /()*+.-]+")
         int_regex = QRegularExpression(r"[0-9]+")
+        tol_regex = QRegularExpression(r"[0-9]*\.?[0-9]+([eE]-?[0-9]+)?")
 
-        for i in self.func_edit, self.upper_limit, self.lower_limit, self.intervals:
+        for i in self.func_edit, self.upper_limit, self.lower_limit, self.intervals, self.order, self.tolerance:
             if i is self.func_edit:
                 i.setValidator(QRegularExpressionValidator(QRegularExpression(expression_regex)))
             elif i in (self.upper_limit, self.lower_limit):
                 i.setValidator(QRegularExpressionValidator(QRegularExpression(float_regex)))
+            elif i is self.tolerance:
+                i.setValidator(QRegularExpressionValidator(QRegularExpression(tol_regex)))
             else:
                 i.setValidator(QRegularExpressionValidator(QRegularExpression(int_regex)))
 
     
     def checkForEmptyFields(self, function, *args):
         """Returns a warning message if empty fields exist else, calls a function"""
-        if not all((self.func_edit.text(), self.upper_limit.text(), self.lower_limit.text(), self.intervals.text())):
+        # Adaptive methods need a tolerance instead of a number of intervals
+        if any(button.isChecked() for button in self.adaptive_rb_list):
+            required = self.tolerance
+        else:
+            required = self.intervals
+        if not all((self.func_edit.text(), self.upper_limit.text(), self.lower_limit.text(), required.text())):
             QMessageBox.warning(self, "Empty Fields",
                                 "Empty Fields exist in function data, ensure required data is entered in every field.",
                                 QMessageBox.StandardButton.Ok)
@@ -181,7 +239,7 @@ class Integration(QWidget):
     def getFuncData(self):
         """Gets data from the QLineEdits in the function data groupbox"""
         # Gets function data
-        function = lambda x: eval(self.func_edit.text())
+        function = get_function(self.func_edit.text())
         x_lower_num = float(self.lower_limit.text())
         x_upper_num = float(self.upper_limit.text())
         x_interval_num = int(self.intervals.text())
@@ -193,17 +251,8 @@ class Integration(QWidget):
     
     def getTableData(self):
         """Gets data from the table widget"""
-        # List to hold x and y axis data
-        list_x, list_y = [], []
-        for index in range(self.table_model.rowCount()):
-            item_x = self.table_model.item(index , 0)
-            item_y = self.table_model.item(index, 1)
-
-            if item_x and item_y:
-                list_x.append(float(item_x.text()))
-                list_y.append(float(item_y.text()))
-
-        return list_x, list_y
+        # Views of the x and y columns over the rows where both are set
+        return self.table_model.filled(0, 1)
     
     def enableTable(self, state):
         """Enables the table or function data groupbox widgets based on the state of the enable checkbox"""
@@ -222,39 +271,172 @@ class Integration(QWidget):
             table_data = self.checkForEmptyFields(self.getFuncData)
             if table_data:
                 func, *_ = table_data
-                for index, num in enumerate(zip(self.x_values, func(self.x_values))):
-                    item = [QStandardItem(str(i)) for i in num]
-                    self.table_model.insertRow(index, item)
+                self.table_model.setColumns(self.x_values, self.algo.evaluate_array(func, self.x_values))
             else:
                 self.fill_table.setChecked(False)
         else:
             self.fill_table.setChecked(False)
             QMessageBox.warning(self, "Error", "Table must be enabled to fill table.", QMessageBox.StandardButton.Ok)
 
+    def loadData(self):
+        """Loads csv, npy or npz data into the table widget"""
+        if self.enable_table.isChecked():
+            loadTableData(self, self.runner, self.table_model)
+        else:
+            QMessageBox.warning(self, "Error", "Table must be enabled to load data", QMessageBox.StandardButton.Ok)
+
+    def solveTableData(self):
+        """Integrates the x and y columns of the table, their x values may be spaced unevenly"""
+        if self.trapezium_rb.isChecked():
+            method = self.algo.trapezoid_data
+        elif self.simps3rd_rb.isChecked():
+            method = self.algo.simpson_data
+        else:
+            QMessageBox.warning(self, "Error", "Only the Trapezium and Simpsons 1/3 rules integrate table data, "
+                                "disable the table to integrate the function.", QMessageBox.StandardButton.Ok)
+            return
+        x_values, y_values = self.getTableData()
+        if len(x_values) < 2:
+            QMessageBox.warning(self, "Empty Fields", "The table needs at least two rows of x and f(x) values.",
+                                QMessageBox.StandardButton.Ok)
+            return
+        # The progress counts the points read, the job stops between chunks once cancelled
+        self.runner.start(lambda monitor: method(x_values, y_values, progress=monitor.progress),
+                          self.showIntegral, unit="points", total=len(x_values))
+
+    def solveCumulative(self):
+        """Integrates from the first x value of the table or function data to every other one"""
+        if self.trapezium_rb.isChecked():
+            method = self.algo.cumulative_trapezoid
+        elif self.simps3rd_rb.isChecked():
+            method = self.algo.cumulative_simpson
+        else:
+            QMessageBox.warning(self, "Error", "The running integral needs the Trapezium or Simpsons 1/3 rule.",
+                                QMessageBox.StandardButton.Ok)
+            return
+
+        if self.enable_table.isChecked():
+            x_values, y_values = self.getTableData()
+            if len(x_values) < 2:
+                QMessageBox.warning(self, "Empty Fields", "The table needs at least two rows of x and f(x) values.",
+                                    QMessageBox.StandardButton.Ok)
+                return
+            job = lambda monitor: (x_values, method(x_values, y_values, progress=monitor.progress))
+        else:
+            function, x_lower_num, x_upper_num, x_interval_num = self.getFuncData()
+            # One vectorized evaluation of the whole grid, then a prefix sum of the interval areas
+            x_values = linspace(x_lower_num, x_upper_num, x_interval_num + 1)
+            job = lambda monitor: (x_values, method(x_values, self.algo.evaluate_array(monitor(function), x_values)))
+        self.runner.start(job, lambda result: self.showRunningIntegral(*result), unit="points", total=len(x_values))
+
+    def showRunningIntegral(self, x_values, running):
+        """Keeps the running integral and shows the integral up to the last x value"""
+        self.running_x, self.running_y = x_values, running
+        self.showIntegral(running[-1])
+        self.plot_running.setEnabled(True)
+        self.export_running.setEnabled(True)
+
+    def plotRunningIntegral(self):
+        if self.running_x is not None:
+            self.running_integral.emit(self.running_x, self.running_y)
+
+    def exportRunningIntegral(self):
+        """Saves the x values and the running integral to a npy, npz or csv file"""
+        if self.running_x is None:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save file", ".",
+                                                   "NumPy array(*.npy);;NumPy archive(*.npz);;CSV file(*.csv)")
+        if file_name:
+            x_values, running = self.running_x, self.running_y
+            self.runner.start(lambda monitor: save_data(file_name, x_values, running, names=("x", "integral")),
+                              lambda result: None)
+
     def solveSimps3rd(self):
         function, x_lower_num, x_upper_num, x_interval_num  = self.getFuncData()
-        answer = self.algo.simpsons_3rd_rule(function, x_lower_num, x_upper_num, x_interval_num)
-        self.integral_found.setText(f"{answer}")
+        if self.use_all_cores.isChecked():
+            text = self.func_edit.text()
+            self.runner.start(lambda monitor: parallel_rule(text, x_lower_num, x_upper_num, x_interval_num,
+                                                            "simpson3", progress=monitor.progress),
+                              self.showIntegral, total=x_interval_num + 1)
+        else:
+            self.runner.start(lambda monitor: self.algo.simpsons_3rd_rule(monitor(function), x_lower_num,
+                                                                          x_upper_num, x_interval_num),
+                              self.showIntegral)
 
     def solveSimps8th(self):
         function, x_lower_num, x_upper_num, x_interval_num  = self.getFuncData()
-        answer = self.algo.simpsons_8th_rule(function, x_lower_num, x_upper_num, x_interval_num)
-        self.integral_found.setText(f"{answer}")
+        if self.use_all_cores.isChecked():
+            text = self.func_edit.text()
+            self.runner.start(lambda monitor: parallel_rule(text, x_lower_num, x_upper_num, x_interval_num,
+                                                            "simpson8", progress=monitor.progress),
+                              self.showIntegral, total=x_interval_num + 1)
+        else:
+            self.runner.start(lambda monitor: self.algo.simpsons_8th_rule(monitor(function), x_lower_num,
+                                                                          x_upper_num, x_interval_num),
+                              self.showIntegral)
     
     def solveTrapzoid(self):
         function, x_lower_num, x_upper_num, x_interval_num  = self.getFuncData()
-        answer = self.algo.trapazoidal_rule(function, x_lower_num, x_upper_num, x_interval_num)
-        self.integral_found.setText(f"{answer}")
+        if self.use_all_cores.isChecked():
+            text = self.func_edit.text()
+            self.runner.start(lambda monitor: parallel_rule(text, x_lower_num, x_upper_num, x_interval_num,
+                                                            "trapezoid", progress=monitor.progress),
+                              self.showIntegral, total=x_interval_num + 1)
+        else:
+            self.runner.start(lambda monitor: self.algo.trapazoidal_rule(monitor(function), x_lower_num,
+                                                                         x_upper_num, x_interval_num),
+                              self.showIntegral)
     
     def solveMonteCarlo(self):
         function, x_lower_num, x_upper_num, x_interval_num  = self.getFuncData()
-        answer = self.algo.monte_carlo(function, x_lower_num, x_upper_num, x_interval_num)
-        self.integral_found.setText(f"{answer}")
+        if self.use_all_cores.isChecked():
+            text = self.func_edit.text()
+            job = lambda monitor: parallel_monte_carlo(text, x_lower_num, x_upper_num, x_interval_num,
+                                                       progress=monitor.progress)
+        else:
+            job = lambda monitor: self.algo.monte_carlo(monitor(function), x_lower_num, x_upper_num, x_interval_num)
+        self.runner.start(job, lambda result: self.showIntegral(*result), total=x_interval_num)
     
+    def solveGaussLegendre(self):
+        function, x_lower_num, x_upper_num, x_interval_num = self.getFuncData()
+        order = int(self.order.text()) if self.order.text() else 5
+        self.runner.start(lambda monitor: self.algo.gauss_legendre(monitor(function), x_lower_num, x_upper_num,
+                                                                   order, x_interval_num),
+                          self.showIntegral)
+
+    def solveAdaptive(self, method):
+        function = get_function(self.func_edit.text())
+        x_lower_num = float(self.lower_limit.text())
+        x_upper_num = float(self.upper_limit.text())
+        tolerance = float(self.tolerance.text())
+        self.runner.start(lambda monitor: method(monitor(function), x_lower_num, x_upper_num, tolerance),
+                          lambda result: self.showIntegral(*result))
+
+    def showIntegral(self, answer, error=None, evals=None):
+        """Shows the integral and, when the method gives them, its error estimate and evaluations"""
+        self.integral_found.setText(f"{answer}")
+        if error is not None:
+            self.error_found.setText(f"{error}")
+        if evals is not None:
+            self.evals_found.setText(f"{evals}")
+
     def solveIntegral(self):
         """Calculates the required integral using the selected method"""
         try:
-            
+            self.error_found.clear()
+            self.evals_found.clear()
+
+            if self.cumulative.isChecked():
+                if self.enable_table.isChecked():
+                    self.solveCumulative()
+                else:
+                    self.checkForEmptyFields(self.solveCumulative)
+                return
+
+            if self.enable_table.isChecked():
+                self.solveTableData()
+                return
+
             if self.simp8th_rb.isChecked():
                 self.checkForEmptyFields(self.solveSimps8th)
             
@@ -267,6 +449,18 @@ class Integration(QWidget):
             if self.montecarlo_rb.isChecked():
                 self.checkForEmptyFields(self.solveMonteCarlo)
 
+            if self.gauss_rb.isChecked():
+                self.checkForEmptyFields(self.solveGaussLegendre)
+
+            if self.adaptive_simps_rb.isChecked():
+                self.checkForEmptyFields(self.solveAdaptive, self.algo.adaptive_simpson)
+
+            if self.kronrod_rb.isChecked():
+                self.checkForEmptyFields(self.solveAdaptive, self.algo.gauss_kronrod)
+
+            if self.romberg_rb.isChecked():
+                self.checkForEmptyFields(self.solveAdaptive, self.algo.romberg)
+
         except SyntaxError as error:
             QMessageBox.warning(self, "Syntax Error",
                                 f"{error}", QMessageBox.StandardButton.Ok)
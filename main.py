@@ -1,14 +1,13 @@
 # Written by Kelvin Addy
 
 # Imports required modules
-import sys, os, time
+import sys, os, time, importlib
 
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QHBoxLayout, QWidget, QStatusBar, QSplashScreen)
-from rootSolving import RootSolving
-from optimization import Optimization
-from integration import Integration
-from graphplot import PlotGraph
+
+# Run with --startup-times to print the import and construction time of every tab module
+STARTUP_TIMES = "--startup-times" in sys.argv
 
 style = """
         QGroupBox#main{
@@ -51,52 +50,75 @@ class MainWindow(QMainWindow):
         for key in method_dict:
             self.main_tab.addTab(key, method_dict[key])
 
+        # Tabs are built, and their modules imported, the first time they are shown
+        self.pending_tabs = {self.root_tab: self.createRootWindow,
+                             self.graph_tab: self.createGraphWindow,
+                             self.optimum_tab: self.createOptimumWindow,
+                             self.integral_tab: self.createIntegralWindow}
+        self.main_tab.currentChanged.connect(self.createTab)
+
         self.setCentralWidget(self.main_tab)
-        self.createRootWindow()
-        self.createOptimumWindow()
-        self.createGraphWindow()
-        self.createIntegralWindow()
+        self.createTab(self.main_tab.currentIndex())
+
+    def createTab(self, index):
+        """Builds the tab at index on its first activation"""
+        create_window = self.pending_tabs.pop(self.main_tab.widget(index), None)
+        if create_window is not None:
+            create_window()
+
+    def loadWidget(self, module_name, class_name, tab):
+        """Imports module_name and adds an instance of its class_name widget to tab"""
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        imported = time.perf_counter()
+        widget = getattr(module, class_name)()
+        wdgt_hbox = QHBoxLayout()
+        wdgt_hbox.addWidget(widget)
+        tab.setLayout(wdgt_hbox)
+
+        if STARTUP_TIMES:
+            print(f"{module_name}: import {imported - start:.3f}s, construction {time.perf_counter() - imported:.3f}s",
+                  file=sys.stderr)
+        return widget
 
     def createRootWindow(self):
         """Sets up the root tab with the required widgets"""
-        root_wdgt = RootSolving()
-        root_wdgt_hbox = QHBoxLayout()
-        root_wdgt_hbox.addWidget(root_wdgt)
-        self.root_tab.setLayout(root_wdgt_hbox)
+        self.root_wdgt = self.loadWidget("rootSolving", "RootSolving", self.root_tab)
 
     def createOptimumWindow(self):
         """Sets up the Optimization tab with the required widgets"""
-        optimum_wdgt = Optimization()
-        optimum_wdgt_hbox = QHBoxLayout()
-        optimum_wdgt_hbox.addWidget(optimum_wdgt)
-        self.optimum_tab.setLayout(optimum_wdgt_hbox)
+        self.optimum_wdgt = self.loadWidget("optimization", "Optimization", self.optimum_tab)
 
     def createGraphWindow(self):
-        """Sets up the Graph Plotting tab with the required widgets"""
-        plot_wdgt = PlotGraph()
-        plot_wdgt_hbox = QHBoxLayout()
-        plot_wdgt_hbox.addWidget(plot_wdgt)
-        self.graph_tab.setLayout(plot_wdgt_hbox)
+        """Sets up the Graph Plotting tab with the required widgets, matplotlib is imported here"""
+        self.plot_wdgt = self.loadWidget("graphplot", "PlotGraph", self.graph_tab)
 
     def createIntegralWindow(self):
         """Sets up the Integral tab with the required widgets"""
-        integral_wdgt = Integration()
-        integral_wdgt_hbox = QHBoxLayout()
-        integral_wdgt_hbox.addWidget(integral_wdgt)
-        self.integral_tab.setLayout(integral_wdgt_hbox)
+        self.integral_wdgt = self.loadWidget("integration", "Integration", self.integral_tab)
+        self.integral_wdgt.running_integral.connect(self.plotRunningIntegral)
+
+    def plotRunningIntegral(self, x, y):
+        """Plots the running integral of the Integral tab on the Graph Plotting tab, building it if needed"""
+        self.main_tab.setCurrentWidget(self.graph_tab)
+        self.createTab(self.main_tab.indexOf(self.graph_tab))
+        self.plot_wdgt.showPlot(x, y)
 
 # Gets the absolute path of the current script file
 basedir = os.path.dirname(__file__)
 
 if __name__ == "__main__":
+    start = time.perf_counter()
     app = QApplication(sys.argv)
     app.setStyleSheet(style)
     app.setStyle("Fusion")
     app.setWindowIcon(QIcon(os.path.join(basedir, "./images/endless.png")))
     splash = QSplashScreen(QPixmap(os.path.join(basedir, "./images/endless.png")))
     splash.show()
-    time.sleep(1)
     app.processEvents()
     window = MainWindow()
+    # Closes the splash as soon as the window is ready
     splash.finish(window)
+    if STARTUP_TIMES:
+        print(f"window ready: {time.perf_counter() - start:.3f}s", file=sys.stderr)
     sys.exit(app.exec())
\ No newline at end of file
@@ -2,8 +2,6 @@
 
 # imports the required widgets
 import os
-from numpy import sin, cos, tan, arange, sqrt
-
 from PyQt6.QtWidgets import (QWidget, QPushButton, QRadioButton,
                              QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QGroupBox, QButtonGroup,
@@ -11,7 +9,10 @@ from PyQt6.QtWidgets import (QWidget, QPushButton, QRadioButton,
 
 from PyQt6.QtGui import QIcon, QRegularExpressionValidator
 from PyQt6.QtCore import Qt, QSize, QRegularExpression
-from algorithms import Algorithms
+from algorithms import Algorithms, CountedFunction
+from expression import get_function
+from autodiff import derivatives
+from workers import JobRunner
 
 basedir = os.path.dirname(__file__)
 
@@ -76,9 +77,9 @@ class Optimization(QWidget):
         self.opti_tol_edit.setClearButtonEnabled(True)
 
         self.opti_newton_df = QLineEdit()
-        self.opti_newton_df.setPlaceholderText("Enter Function's first derivative")
+        self.opti_newton_df.setPlaceholderText("Enter Function's first derivative, or leave empty to compute it")
         self.opti_newton_dff = QLineEdit()
-        self.opti_newton_dff.setPlaceholderText("Enter Function's Second derivative")
+        self.opti_newton_dff.setPlaceholderText("Enter Function's Second derivative, or leave empty to compute it")
         self.opti_newton_guess = QLineEdit()
 
         self.opti_golden_a = QLineEdit()
@@ -127,6 +128,8 @@ class Optimization(QWidget):
 
         self.solvebtn = QPushButton("Calculate")
         self.solvebtn.clicked.connect(self.solveOptimum)
+        self.runner = JobRunner()
+        self.runner.busy.connect(self.solvebtn.setDisabled)
         self.minima = QCheckBox("Minimum")
         self.minima.setChecked(True)
         self.maxima = QCheckBox("Maximum")
@@ -149,6 +152,7 @@ class Optimization(QWidget):
         grp_bx_vbox.addWidget(opti_parabolic_grpbx)
         grp_bx_vbox.addWidget(opti_newton_grpbx)
         grp_bx_vbox.addLayout(btn_chkbx_hbox)
+        grp_bx_vbox.addWidget(self.runner)
 
         # Adds the Groupboxes to the main layout
         self.optimum_main_hbox.addLayout(grp_bx_vbox)
@@ -158,6 +162,7 @@ class Optimization(QWidget):
         """Sets up the right side of the root window"""
         self.optimum_label = QLabel("")
         self.count_label = QLabel("")
+        self.evals_label = QLabel("")
         self.optimum_x = QLabel("")
         self.minima_label = QLabel("Minimum:")
 
@@ -168,6 +173,7 @@ class Optimization(QWidget):
         results_frm.addRow(self.minima_label, self.optimum_label)
         results_frm.addRow(QLabel("Occurs at: x ="), self.optimum_x)
         results_frm.addRow(QLabel("Iterations:"), self.count_label)
+        results_frm.addRow(QLabel("Evaluations:"), self.evals_label)
         results_grpbx.setLayout(results_frm)
 
         # Adds the groupBoxes to the main layout
@@ -214,14 +220,19 @@ class Optimization(QWidget):
     def getData(self,**kwargs):
         """Gets text inputted in the lineEdits"""
         self.tolerance = float(self.opti_tol_edit.text())
+        function = get_function(self.opti_func_edit.text())
         if self.maxima.isChecked():
-            self.function = lambda x: -eval(self.opti_func_edit.text())
+            self.function = CountedFunction(lambda x: -function(x))
         else:
-            self.function = lambda x: eval(self.opti_func_edit.text())
+            self.function = CountedFunction(function)
 
         if "newton" in kwargs:
-            self.dff = lambda x: eval(self.opti_newton_dff.text())
-            self.df = lambda x: eval(self.opti_newton_df.text())
+            if self.opti_newton_df.text() and self.opti_newton_dff.text():
+                self.dff = CountedFunction(get_function(self.opti_newton_dff.text()))
+                self.df = CountedFunction(get_function(self.opti_newton_df.text()))
+            else:
+                # f, f' and f'' from one pass of automatic differentiation
+                self.derivatives = CountedFunction(derivatives(self.opti_func_edit.text()))
             self.x0 = float(self.opti_newton_guess.text())
 
         if "golden" in kwargs:
@@ -248,17 +259,33 @@ class Optimization(QWidget):
         else:
             self.optimum_label.setText(f"{self.function(answer)}")
 
+    def setResults(self, answer, count, *functions):
+        """Shows the optimum, the iterations and the evaluations spent by the method"""
+        # Counted before checkMaxima evaluates the function at the optimum
+        evals = sum(function.evaluations for function in (self.function, *functions))
+        self.evals_label.setText(f"{evals}")
+        self.checkMaxima(answer)
+        self.count_label.setText(f"{count}")
+        self.optimum_x.setText(f"{answer}")
+
     def solveNewton(self):
-        if not any((self.opti_newton_df.text(), self.opti_newton_guess.text(), self.opti_newton_dff.text())):
+        if not self.opti_newton_guess.text():
             QMessageBox.warning(self, "Empty Fields",
-                                "f'(x),f''(x) or Initial guess field empty",
+                                "Initial guess field empty",
                                 QMessageBox.StandardButton.Ok)
         else:
             self.getData(newton=True)
-            answer, count = self.algorithms.newtons_method(self.df, self.dff, self.x0, self.tolerance)
-            self.checkMaxima(answer)
-            self.count_label.setText(f"{count}")
-            self.optimum_x.setText(f"{answer}")
+            x0, tolerance = self.x0, self.tolerance
+            if self.opti_newton_df.text() and self.opti_newton_dff.text():
+                df, dff = self.df, self.dff
+                self.runner.start(lambda monitor: self.algorithms.newtons_method(monitor(df), monitor(dff),
+                                                                                 x0, tolerance),
+                                  lambda result: self.setResults(*result, df, dff))
+            else:
+                derivatives = self.derivatives
+                self.runner.start(lambda monitor: self.algorithms.newtons_method_auto(monitor(derivatives),
+                                                                                      x0, tolerance),
+                                  lambda result: self.setResults(*result, derivatives))
 
     def solveGolden(self):
         if not any((self.opti_golden_b.text(), self.opti_golden_a.text())):
@@ -273,10 +300,10 @@ class Optimization(QWidget):
                                     QMessageBox.StandardButton.Ok)
 
             else:
-                answer, count = self.algorithms.golden_section_search(self.function, self.a, self.b, self.tolerance)
-                self.checkMaxima(answer)
-                self.count_label.setText(f"{count}")
-                self.optimum_x.setText(f"{answer}")
+                function, a, b, tolerance = self.function, self.a, self.b, self.tolerance
+                self.runner.start(lambda monitor: self.algorithms.golden_section_search(monitor(function), a, b,
+                                                                                        tolerance),
+                                  lambda result: self.setResults(*result))
 
     def solveParabolic(self):
         if not any((self.opti_parabolic_2.text(), self.opti_parabolic_1.text(), self.opti_parabolic_3.text())):
@@ -285,21 +312,20 @@ class Optimization(QWidget):
                                 QMessageBox.StandardButton.Ok)
         else:
             self.getData(parabolic=True)
-            answer, count = self.algorithms.parabolic_interpolation(self.function, self.x1, self.x2, self.x3,
-                                                                    self.tolerance)
-            self.checkMaxima(answer)
-            self.count_label.setText(f"{count}")
-            self.optimum_x.setText(f"{answer}")
+            function, x1, x2, x3, tolerance = self.function, self.x1, self.x2, self.x3, self.tolerance
+            self.runner.start(lambda monitor: self.algorithms.parabolic_interpolation(monitor(function), x1, x2, x3,
+                                                                                      tolerance),
+                              lambda result: self.setResults(*result))
 
     def solveOptimum(self):
         """Returns the computed root of the function"""
         try:
             if self.newton_rb.isChecked():
-                    self.checkForErrors(self.solveNewton)
+                    self.checkForEmptyFields(self.solveNewton)
             if self.golden_rb.isChecked():
-                    self.checkForErrors(self.solveGolden)
+                    self.checkForEmptyFields(self.solveGolden)
             if self.parabolic_rb.isChecked():
-                    self.checkForErrors(self.solveParabolic)
+                    self.checkForEmptyFields(self.solveParabolic)
 
         except SyntaxError as error:
             QMessageBox.warning(self, "Syntax Error",
@@ -0,0 +1,170 @@
+"""This module contains the process-pool backend that spreads large integrations over every core"""
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from algorithms import Algorithms
+from expression import get_function
+
+# Number of shards a job is split into. It does not depend on the number of
+# workers, so the shards, their seeds and the result are the same on any machine
+SHARDS = 64
+
+# Scale factor of the weighted sum of each composite rule
+RULE_SCALES = {"simpson3": 1 / 3, "simpson8": 3 / 8, "trapezoid": 1.0}
+
+# Seconds between two checks of the progress callback while the shards run
+POLL_INTERVAL = 0.1
+
+_executor, _workers = None, None
+
+
+def get_executor(workers=None):
+    """Returns the shared process pool, started on first use with workers processes
+
+    Workers are spawned rather than forked, as the GUI process runs Qt threads.
+    """
+    global _executor, _workers
+    workers = workers or os.cpu_count() or 1
+    if _executor is None or _workers != workers:
+        shutdown()
+        _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        _workers = workers
+    return _executor
+
+
+def shutdown():
+    """Stops the shared process pool"""
+    global _executor, _workers
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor, _workers = None, None
+
+
+def _rule_shard(text, a, b, n, rule, start, stop):
+    # The expression is shipped as text and compiled once per worker by the expression cache
+    return Algorithms().weighted_sum(get_function(text), a, b, n, rule, start=start, stop=stop)
+
+
+def _monte_carlo_shard(text, a, b, n, seed, sampling):
+    return Algorithms().monte_carlo(get_function(text), a, b, n, seed=seed, sampling=sampling)
+
+
+def gather(futures, sizes, progress=None):
+    """Returns the results of the futures in order
+
+    Whenever shards finish, and at least every POLL_INTERVAL seconds, progress is called
+    with the total size of the shards just finished. If it raises, the shards not yet
+    started are cancelled and the error is raised again, the running ones are left to
+    finish in their workers.
+    """
+    pending, shard_sizes = set(futures), dict(zip(futures, sizes))
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                # Raises the error of a failed shard
+                future.result()
+            if progress is not None:
+                progress(sum(shard_sizes[future] for future in done))
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    return [future.result() for future in futures]
+
+
+def parallel_rule(text, a, b, n, rule, workers=None, shards=SHARDS, progress=None):
+    """Approximates the integral of the expression text from a to b with a composite rule
+    on a process pool
+
+    The n + 1 nodes are split into shards contiguous ranges, each reduced by
+    Algorithms.weighted_sum in a worker, and the partial sums are added with math.fsum.
+
+    Parameters
+    ----------
+    text : str
+        The function to be integrated, in python syntax.
+    a, b : float
+        The limits of the integration.
+    n : int
+        The number of intervals to use.
+    rule : str
+        One of "simpson3", "simpson8" or "trapezoid".
+    workers : int, optional
+        The number of processes, defaults to the number of cores.
+    shards : int
+        The number of node ranges the grid is split into.
+    progress : callable, optional
+        Called with the number of nodes of the shards finished, it may raise to stop, see gather.
+
+    Returns
+    -------
+    float
+        The approximate integral of the expression from a to b.
+    """
+    if rule not in RULE_SCALES:
+        raise ValueError(f"Unknown composite rule '{rule}'")
+    # Parses the expression here, so syntax errors are raised before any work is sent
+    get_function(text)
+
+    bounds = np.linspace(0, n + 1, min(shards, n + 1) + 1).astype(int)
+    executor = get_executor(workers)
+    futures = [executor.submit(_rule_shard, text, a, b, n, rule, int(start), int(stop))
+               for start, stop in zip(bounds[:-1], bounds[1:])]
+    partial_sums = gather(futures, np.diff(bounds).tolist(), progress)
+    return math.fsum(partial_sums) * (b - a) / n * RULE_SCALES[rule]
+
+
+def parallel_monte_carlo(text, a, b, n, seed=None, sampling="plain", workers=None, shards=SHARDS,
+                         progress=None):
+    """Approximates the integral of the expression text from a to b with the Monte Carlo
+    method on a process pool
+
+    The n samples are split into shards parts, each drawn by Algorithms.monte_carlo in a
+    worker from its own stream spawned from np.random.SeedSequence(seed). The estimates
+    are combined weighted by their number of samples.
+
+    Parameters
+    ----------
+    text : str
+        The function to be integrated, in python syntax.
+    a, b : float
+        The limits of the integration.
+    n : int
+        The number of samples to use.
+    seed : int, optional
+        Seed of the random streams, the same seed gives the same estimate for any workers.
+    sampling : str
+        "plain", "antithetic" or "stratified", see Algorithms.monte_carlo.
+    workers : int, optional
+        The number of processes, defaults to the number of cores.
+    shards : int
+        The number of parts the samples are split into.
+    progress : callable, optional
+        Called with the number of samples of the shards finished, it may raise to stop, see gather.
+
+    Returns
+    -------
+    tuple
+        The approximate integral of the expression from a to b and its standard error.
+    """
+    get_function(text)
+    if n < 1:
+        raise ValueError("The Monte Carlo method needs at least one sample")
+
+    # Every shard needs two samples for its standard error
+    shards = max(min(shards, n // 2), 1)
+    sizes = [n // shards + (i < n % shards) for i in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+    executor = get_executor(workers)
+    futures = [executor.submit(_monte_carlo_shard, text, a, b, size, shard_seed, sampling)
+               for size, shard_seed in zip(sizes, seeds)]
+
+    results = gather(futures, sizes, progress)
+    estimate = math.fsum(size * result[0] for size, result in zip(sizes, results)) / n
+    error = math.sqrt(math.fsum((size * result[1]) ** 2 for size, result in zip(sizes, results))) / n
+    return estimate, error
@@ -2,15 +2,18 @@
 
 # imports the required widgets
 import os
-from numpy import sin, cos, tan, arange, sqrt
 from PyQt6.QtWidgets import (QWidget, QPushButton, QRadioButton,
                              QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QGroupBox, QButtonGroup,
-                             QGridLayout, QFormLayout, QMessageBox)
+                             QGridLayout, QFormLayout, QMessageBox,
+                             QCheckBox, QTableView)
 
-from PyQt6.QtGui import QIcon, QPixmap, QRegularExpressionValidator
+from PyQt6.QtGui import QIcon, QPixmap, QRegularExpressionValidator, QStandardItemModel, QStandardItem
 from PyQt6.QtCore import Qt, QSize, QRegularExpression
-from algorithms import Algorithms
+from algorithms import Algorithms, CountedFunction
+from expression import get_function
+from autodiff import derivatives
+from workers import JobRunner
 
 basedir = os.path.dirname(__file__)
 
@@ -37,13 +40,15 @@ class RootSolving(QWidget):
         self.bisection_rb = QRadioButton("Bisection Method")
         self.false_rb = QRadioButton("False-Position Method")
         self.illinois_rb = QRadioButton("Illinois's Method")
+        self.brent_rb = QRadioButton("Brent's Method")
 
         self.methods_rb_list = [self.newton_rb, self.secant_rb,
                                 self.steph_rb, self.bisection_rb,
-                                self.false_rb, self.illinois_rb]
+                                self.false_rb, self.illinois_rb,
+                                self.brent_rb]
 
         button_tooltips = []
-        for i in range(6):
+        for i in range(len(self.methods_rb_list)):
             buttons = QPushButton()
             buttons.setIcon(QIcon(os.path.join(basedir,"./images/information.png")))
             buttons.setStyleSheet("border-style:solid; border-width:0px")
@@ -93,7 +98,7 @@ class RootSolving(QWidget):
         self.tol_edit.setClearButtonEnabled(True)
 
         self.newton_df = QLineEdit()
-        self.newton_df.setPlaceholderText("Enter Function's first derivative")
+        self.newton_df.setPlaceholderText("Enter Function's first derivative, or leave empty to compute it")
         self.newton_guess = QLineEdit()
 
         self.secant_x1 = QLineEdit()
@@ -103,6 +108,8 @@ class RootSolving(QWidget):
 
         self.bracket_x1 = QLineEdit()
         self.bracket_x2 = QLineEdit()
+        self.all_roots = QCheckBox("Find all roots")
+        self.all_roots.setEnabled(False)
 
         self.line_edit_list = [self.func_edit, self.tol_edit, self.newton_guess,
                                self.newton_df, self.steph_guess, self.secant_x1,
@@ -145,12 +152,15 @@ class RootSolving(QWidget):
         bracket_frm = QFormLayout()
         bracket_frm.addRow(QLabel("x-lower:"), self.bracket_x1)
         bracket_frm.addRow(QLabel("x-upper:"), self.bracket_x2)
+        bracket_frm.addRow(self.all_roots)
         bracket_grpbx = QGroupBox("Bracketing Methods")
         bracket_grpbx.setObjectName("main")
         bracket_grpbx.setLayout(bracket_frm)
 
         self.solvebtn = QPushButton("Calculate Root")
         self.solvebtn.clicked.connect(self.solveRoot)
+        self.runner = JobRunner()
+        self.runner.busy.connect(self.solvebtn.setDisabled)
 
         # layout for all the GroupBox
         grp_bx_vbox = QVBoxLayout()
@@ -158,6 +168,7 @@ class RootSolving(QWidget):
         grp_bx_vbox.addWidget(bracket_grpbx)
         grp_bx_vbox.addWidget(Closed_grpbx)
         grp_bx_vbox.addWidget(self.solvebtn, stretch=1)
+        grp_bx_vbox.addWidget(self.runner)
 
         # Adds the Groupboxes to the main layout
         self.root_main_hbox.addLayout(grp_bx_vbox)
@@ -167,6 +178,7 @@ class RootSolving(QWidget):
         """Sets up the right side of the root window"""
         self.solution_label = QLabel("")
         self.count_label = QLabel("")
+        self.evals_label = QLabel("")
 
         # GroupBox for QlineEdits
         results_grpbx = QGroupBox("Results")
@@ -174,12 +186,27 @@ class RootSolving(QWidget):
         results_frm = QFormLayout()
         results_frm.addRow(QLabel("Root Found:"), self.solution_label)
         results_frm.addRow(QLabel("Iterations:"), self.count_label)
+        results_frm.addRow(QLabel("Evaluations:"), self.evals_label)
         results_grpbx.setLayout(results_frm)
 
+        # Table listing every root found by the find all roots mode
+        self.roots_model = QStandardItemModel()
+        self.roots_model.setColumnCount(2)
+        self.roots_model.setHorizontalHeaderLabels(["Root", "Iterations"])
+        roots_table = QTableView()
+        roots_table.horizontalHeader().setStretchLastSection(True)
+        roots_table.setModel(self.roots_model)
+
+        roots_vbox = QVBoxLayout()
+        roots_vbox.addWidget(roots_table)
+        roots_grpbx = QGroupBox("All Roots")
+        roots_grpbx.setObjectName("main")
+        roots_grpbx.setLayout(roots_vbox)
+
         # Adds the groupBoxes to the main layout
         results_vbox = QVBoxLayout()
         results_vbox.addWidget(results_grpbx)
-        results_vbox.addStretch()
+        results_vbox.addWidget(roots_grpbx)
         self.root_main_hbox.addLayout(results_vbox)
         self.setLayout(self.root_main_hbox)
 
@@ -188,6 +215,7 @@ class RootSolving(QWidget):
         for field in line_edits[2:]:
             field.setEnabled(False)
             field.setClearButtonEnabled(True)
+        self.all_roots.setEnabled(False)
 
     def enableField(self, button):
         if button == self.newton_rb:
@@ -204,10 +232,15 @@ class RootSolving(QWidget):
             self.disableField(self.line_edit_list)
             self.steph_guess.setEnabled(True)
 
-        elif button in [self.bisection_rb, self.false_rb, self.illinois_rb]:
+        elif button in [self.bisection_rb, self.false_rb, self.illinois_rb, self.brent_rb]:
             self.disableField(self.line_edit_list)
             self.bracket_x1.setEnabled(True)
             self.bracket_x2.setEnabled(True)
+            # Brent's Method has no batched version to refine every bracket at once
+            if button == self.brent_rb:
+                self.all_roots.setChecked(False)
+            else:
+                self.all_roots.setEnabled(True)
 
     def validateFields(self):
         """Allows input of text which match a given pattern"""
@@ -222,11 +255,15 @@ class RootSolving(QWidget):
 
     def getData(self, **kwargs):
         """Gets text inputted in the lineEdits"""
-        self.function = lambda x: eval(self.func_edit.text())
+        self.function = CountedFunction(get_function(self.func_edit.text()))
         self.tolerance = float(self.tol_edit.text())
 
         if "newton" in kwargs:
-            self.df = lambda x: eval(self.newton_df.text())
+            if self.newton_df.text():
+                self.df = CountedFunction(get_function(self.newton_df.text()))
+            else:
+                # f and f' from one pass of automatic differentiation
+                self.df = CountedFunction(derivatives(self.func_edit.text()))
             self.x0 = float(self.newton_guess.text())
 
         if "secant" in kwargs:
@@ -256,39 +293,72 @@ class RootSolving(QWidget):
                                 QMessageBox.StandardButton.Ok)
         else:
             self.getData(bracket=True)
-            if self.function(self.x_l) * self.function(self.x_u) > 0:
+            function, x_l, x_u, tolerance = self.function, self.x_l, self.x_u, self.tolerance
+            if self.all_roots.isChecked():
+                self.solveAllRoots()
+            elif function(x_l) * function(x_u) > 0:
                 QMessageBox.warning(self, "Value Error",
                                     "Root is not within the interval",
                                     QMessageBox.StandardButton.Ok)
             else:
+                # Only counts the evaluations of the method itself
+                function.reset()
                 if self.bisection_rb.isChecked():
-                    answer, count = self.algorithms.bisection_algorithm(self.function, self.x_l, self.x_u,
-                                                                        margin=self.tolerance)
-                    self.count_label.setText(f"{count}")
-                    self.solution_label.setText(f"{answer}")
-                
-                if self.illinois_rb.isChecked():
-                    answer, count = self.algorithms.illinois_algorithm(self.function, self.x_l, self.x_u,
-                                                                       margin=self.tolerance)
-                    self.count_label.setText(f"{count}")
-                    self.solution_label.setText(f"{answer}")
-                
-                if self.false_rb.isChecked():
-                    answer, count = self.algorithms.regula_falsi_algorithm(self.function, self.x_l, self.x_u,
-                                                                           margin=self.tolerance)
-                    self.count_label.setText(f"{count}")
-                    self.solution_label.setText(f"{answer}")
+                    method = self.algorithms.bisection_algorithm
+                elif self.illinois_rb.isChecked():
+                    method = self.algorithms.illinois_algorithm
+                elif self.false_rb.isChecked():
+                    method = self.algorithms.regula_falsi_algorithm
+                else:
+                    method = self.algorithms.brent_algorithm
+                self.runner.start(lambda monitor: method(monitor(function), x_l, x_u, margin=tolerance),
+                                  lambda result: self.setResults(*result[:2]))
+
+    def solveAllRoots(self):
+        """Lists every root between x-lower and x-upper in the roots table"""
+        if self.bisection_rb.isChecked():
+            method = "bisection"
+        elif self.false_rb.isChecked():
+            method = "regula_falsi"
+        elif self.illinois_rb.isChecked():
+            method = "illinois"
+        else:
+            QMessageBox.warning(self, "Error", "Finding all roots needs the Bisection, False-Position or "
+                                "Illinois's Method", QMessageBox.StandardButton.Ok)
+            return
+        function, x_l, x_u, tolerance = self.function, self.x_l, self.x_u, self.tolerance
+        self.runner.start(lambda monitor: self.algorithms.find_all_roots(monitor(function), x_l, x_u,
+                                                                         margin=tolerance, method=method),
+                          self.showAllRoots)
+
+    def showAllRoots(self, result):
+        """Fills the roots table with the roots found by solveAllRoots"""
+        roots, counts = result
+        self.roots_model.setRowCount(0)
+        for root, count in zip(roots, counts):
+            self.roots_model.appendRow([QStandardItem(f"{root}"), QStandardItem(f"{count}")])
+        self.setResults(f"{len(roots)} roots found", counts.sum())
+
+    def setResults(self, answer, count, *functions):
+        """Shows the root, the iterations and the evaluations of self.function and functions"""
+        self.solution_label.setText(f"{answer}")
+        self.count_label.setText(f"{count}")
+        evals = sum(function.evaluations for function in (self.function, *functions))
+        self.evals_label.setText(f"{evals}")
 
     def solveNewton(self):
-        if not all((self.newton_df.text(), self.newton_guess.text())):
+        if not self.newton_guess.text():
             QMessageBox.warning(self, "Empty Fields",
-                                "f'(x) or Initial guess field empty",
+                                "Initial guess field empty",
                                 QMessageBox.StandardButton.Ok)
         else:
             self.getData(newton=True)
-            answer, count = self.algorithms.newton_raphson(self.function, self.df, self.x0, self.tolerance)
-            self.count_label.setText(f"{count}")
-            self.solution_label.setText(f"{answer}")
+            function, df, x0, tolerance = self.function, self.df, self.x0, self.tolerance
+            if self.newton_df.text():
+                job = lambda monitor: self.algorithms.newton_raphson(monitor(function), monitor(df), x0, tolerance)
+            else:
+                job = lambda monitor: self.algorithms.newton_raphson_auto(monitor(df), x0, tolerance)
+            self.runner.start(job, lambda result: self.setResults(*result, df))
 
     def solveSecant(self):
         if not all((self.secant_x2.text(), self.secant_x1.text())):
@@ -303,9 +373,10 @@ class RootSolving(QWidget):
                                     QMessageBox.StandardButton.Ok)
 
             else:
-                answer, count = self.algorithms.secant_algorithm(self.function, self.x1, self.x2, self.tolerance)
-                self.count_label.setText(f"{count}")
-                self.solution_label.setText(f"{answer}")
+                function, x1, x2, tolerance = self.function, self.x1, self.x2, self.tolerance
+                self.runner.start(lambda monitor: self.algorithms.secant_algorithm(monitor(function), x1, x2,
+                                                                                   margin=tolerance),
+                                  lambda result: self.setResults(*result))
 
     def solveSteph(self):
         if self.steph_guess.text() == "":
@@ -314,26 +385,24 @@ class RootSolving(QWidget):
                                 QMessageBox.StandardButton.Ok)
         else:
             self.getData(steph=True)
-            if self.a == 0:
-                QMessageBox.warning(self, "Division by zero error",
-                                    "Initial guess cannot be zero",
-                                    QMessageBox.StandardButton.Ok)
-            else:
-                answer, count = self.algorithms.steffensen_algorithm(self.function, self.a, self.tolerance)
-                self.count_label.setText(f"{count}")
-                self.solution_label.setText(f"{answer}")
+            function, a, tolerance = self.function, self.a, self.tolerance
+            self.runner.start(lambda monitor: self.algorithms.steffensen_algorithm(monitor(function), a,
+                                                                                   margin=tolerance),
+                              lambda result: self.setResults(*result))
 
     def solveRoot(self):
         """Returns the computed root of the function"""
         try:
+            self.evals_label.clear()
             if self.newton_rb.isChecked():
-                self.checkForErrors(self.solveNewton)
+                self.checkForEmptyFields(self.solveNewton)
             if self.secant_rb.isChecked():
-                self.checkForErrors(self.solveSecant)
+                self.checkForEmptyFields(self.solveSecant)
             if self.steph_rb.isChecked():
-                self.checkForErrors(self.solveSteph)
-            if any((self.bisection_rb.isChecked(), self.illinois_rb.isChecked(), self.false_rb.isChecked())):
-                self.checkForErrors(self.solveBracket)
+                self.checkForEmptyFields(self.solveSteph)
+            if any((self.bisection_rb.isChecked(), self.illinois_rb.isChecked(), self.false_rb.isChecked(),
+                    self.brent_rb.isChecked())):
+                self.checkForEmptyFields(self.solveBracket)
 
         except SyntaxError as error:
             QMessageBox.warning(self, "Syntax Error",
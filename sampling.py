@@ -0,0 +1,101 @@
+"""This module contains the curvature-adaptive sampler of the function plots"""
+import numpy as np
+
+from algorithms import Algorithms
+
+# Points of the coarse grid the sampler starts from
+INITIAL_POINTS = 257
+# Largest number of evaluations of the function
+MAX_EVALUATIONS = 100_000
+# Narrowest segment refined, as a fraction of a pixel
+MIN_WIDTH = 1 / 64
+# A segment whose jump does not shrink below this fraction of its parent's jump, for
+# DISCONTINUITY_ROUNDS halvings in a row below a pixel, holds a discontinuity
+JUMP_RATIO = 0.75
+DISCONTINUITY_ROUNDS = 3
+
+
+def adaptive_sample(f, a, b, width=1000, height=1000, max_evals=MAX_EVALUATIONS, initial=INITIAL_POINTS):
+    """Samples f on [a, b] densely where it bends and sparsely where it is straight
+
+    Starting from a uniform grid, every segment whose midpoint deviates from the chord
+    by more than a pixel is halved, one vectorized evaluation of all the midpoints per
+    round. Segments that keep the same jump while shrinking below a pixel hold a
+    discontinuity, such as a pole of tan, they are not refined further and a NaN is
+    inserted so the line is not drawn across them.
+    Parameters
+    ----------
+    f : function
+        The function to be sampled, preferably accepting ndarrays.
+    a, b : float
+        The interval sampled, in either order.
+    width, height : int
+        The size of the axes in pixels, which sets the tolerances.
+    max_evals : int
+        The largest number of evaluations of f, the coarse grid included.
+    initial : int
+        The number of points of the coarse grid.
+
+    Returns
+    -------
+    tuple
+        The sorted x and y of the samples, and the number of evaluations of f.
+    """
+    algorithms = Algorithms()
+    # Segment widths are compared with the pixel width, so they must be positive
+    a, b = min(a, b), max(a, b)
+    x = np.linspace(a, b, max(min(initial, max_evals), 2))
+    y = algorithms.evaluate_array(f, x)
+    evals = x.size
+
+    # Tolerances, the y range ignores the outliers of poles
+    finite = y[np.isfinite(y)]
+    span = np.subtract(*np.percentile(finite, [98, 2])) if finite.size else 0.0
+    tol = (span if span > 0 else 1.0) / height
+    pixel = (b - a) / width
+    min_width = pixel * MIN_WIDTH
+
+    # Active segments, their jumps and how many rounds their jump did not shrink
+    x0, y0, x1, y1 = x[:-1], y[:-1], x[1:], y[1:]
+    jump = np.full(x0.shape, np.inf)
+    streak = np.zeros(x0.shape, dtype=int)
+    new_x, new_y, breaks = [x], [y], []
+
+    while x0.size and evals < max_evals:
+        if x0.size > max_evals - evals:
+            # Within the budget, the segments with the largest jumps are refined first
+            keep = np.argsort(-np.nan_to_num(np.abs(y1 - y0), nan=np.inf))[:max_evals - evals]
+            x0, y0, x1, y1, jump, streak = (i[keep] for i in (x0, y0, x1, y1, jump, streak))
+        xm = (x0 + x1) / 2
+        ym = algorithms.evaluate_array(f, xm)
+        evals += xm.size
+        new_x.append(xm)
+        new_y.append(ym)
+
+        # Deviation of the midpoint from the chord, infinite where the finiteness changes
+        with np.errstate(invalid="ignore"):
+            deviation = np.abs(ym - (y0 + y1) / 2)
+        finite0, finitem, finite1 = np.isfinite(y0), np.isfinite(ym), np.isfinite(y1)
+        deviation[(finite0 != finite1) | (finite0 & finite1 & ~finitem)] = np.inf
+        deviation[~finite0 & ~finite1] = 0.0
+        refine = (deviation > tol) & (x1 - x0 > 2 * min_width)
+
+        # Both halves of every refined segment
+        x0, y0, x1, y1, xm, ym = (i[refine] for i in (x0, y0, x1, y1, xm, ym))
+        parent_jump, parent_streak = np.tile(jump[refine], 2), np.tile(streak[refine], 2)
+        x0, y0, x1, y1 = (np.concatenate(i) for i in ((x0, xm), (y0, ym), (xm, x1), (ym, y1)))
+        with np.errstate(invalid="ignore"):
+            jump = np.abs(y1 - y0)
+            stuck = (jump >= JUMP_RATIO * parent_jump) & (x1 - x0 <= pixel)
+        streak = np.where(stuck, parent_streak + 1, 0)
+
+        # Discontinuities are left, with a break in the line
+        jumps = streak >= DISCONTINUITY_ROUNDS
+        breaks.append((x0[jumps] + x1[jumps]) / 2)
+        x0, y0, x1, y1, jump, streak = (i[~jumps] for i in (x0, y0, x1, y1, jump, streak))
+
+    breaks = np.concatenate(breaks) if breaks else np.empty(0)
+    x = np.concatenate(new_x + [breaks])
+    y = np.concatenate(new_y + [np.full(breaks.shape, np.nan)])
+    order = np.argsort(x, kind="stable")
+    return x[order], y[order], evals
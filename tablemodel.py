@@ -0,0 +1,133 @@
+"""This module contains the table model backed by float64 NumPy columns and the loading of data files into it"""
+import os
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import QFileDialog, QMessageBox
+
+from datafiles import load_csv, load_npy, load_npz
+
+
+class ArrayTableModel(QAbstractTableModel):
+    """Table model holding every column in its own float64 array
+
+    The view only asks for the rows it shows, so a table of millions of rows costs
+    no more to display than a small one. Empty cells hold NaN. Columns may be
+    read-only memory maps, their cells are then not editable.
+    """
+    def __init__(self, rows=0, columns=2, headers=None):
+        super().__init__()
+        self._columns = list(np.full((columns, rows), np.nan))
+        self._headers = list(headers) if headers else []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or not self._columns else len(self._columns[0])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole) and index.isValid():
+            value = self._columns[index.column()][index.row()]
+            return "" if np.isnan(value) else f"{value}"
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Parses an edited cell, an empty cell becomes NaN"""
+        if role != Qt.ItemDataRole.EditRole or not index.isValid() \
+                or not self._columns[index.column()].flags.writeable:
+            return False
+        try:
+            number = float(value) if str(value).strip() else np.nan
+        except ValueError:
+            return False
+        self._columns[index.column()][index.row()] = number
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if index.isValid() and self._columns[index.column()].flags.writeable:
+            return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+        return super().flags(index)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal \
+                and section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def setHeaders(self, headers):
+        self._headers = list(headers)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, max(self.columnCount() - 1, 0))
+
+    def setArray(self, data, headers=None):
+        """Replaces every cell with the rows of the 2D array data, its columns are kept as views"""
+        data = np.asarray(data, dtype=float)
+        self.setColumns(*(data.reshape(len(data), -1).T), headers=headers)
+
+    def setColumns(self, *columns, headers=None):
+        """Replaces every cell with the 1D arrays columns, float64 arrays are kept without a copy"""
+        columns = [np.asarray(column, dtype=float) for column in columns]
+        if any(len(column) != len(columns[0]) for column in columns):
+            raise ValueError("Every column of the table needs the same number of rows")
+        self.beginResetModel()
+        self._columns = columns
+        if headers is not None:
+            self._headers = list(headers)
+        self.endResetModel()
+
+    def column(self, i):
+        """Returns column i without a copy, writing to it changes the table"""
+        return self._columns[i]
+
+    def headers(self):
+        return list(self._headers)
+
+    def filled(self, *columns):
+        """Returns the given columns, 0 and 1 by default, over the rows where all of them are set
+
+        They are views of the table when the set rows come first, else copies.
+        """
+        columns = [self._columns[i] for i in (columns or (0, 1))]
+        empty = np.zeros(len(columns[0]), dtype=bool)
+        for column in columns:
+            empty |= np.isnan(column)
+        if not empty.any():
+            return tuple(columns)
+        first_empty = int(empty.argmax())
+        if not empty[first_empty:].all():
+            keep = ~empty
+            return tuple(column[keep] for column in columns)
+        return tuple(column[:first_empty] for column in columns)
+
+
+def loadTableData(parent, runner, model):
+    """Asks for a csv, npy or npz file and loads its columns into model
+
+    npy and npz files are memory mapped, their data is read from disk as it is used.
+    csv files are parsed in the background by runner, whose progress counts the bytes read.
+    """
+    file_name, _ = QFileDialog.getOpenFileName(parent, "Open file", ".",
+                                               "Data files(*.csv *.npy *.npz);;CSV file(*.csv);;"
+                                               "NumPy files(*.npy *.npz)")
+    if not file_name:
+        return
+    try:
+        if file_name.lower().endswith(".npy"):
+            showTableData(parent, model, *load_npy(file_name))
+        elif file_name.lower().endswith(".npz"):
+            showTableData(parent, model, *load_npz(file_name))
+        else:
+            runner.start(lambda monitor: load_csv(file_name, monitor.progress),
+                         lambda result: showTableData(parent, model, *result),
+                         unit="bytes", total=os.path.getsize(file_name))
+    except (OSError, ValueError) as error:
+        QMessageBox.warning(parent, "Value Error", f"{error}", QMessageBox.StandardButton.Ok)
+
+
+def showTableData(parent, model, columns, header):
+    """Shows the loaded columns in the table of model, which needs an x and a y column"""
+    if len(columns) < 2:
+        QMessageBox.warning(parent, "Value Error", "The file needs an x and a y column", QMessageBox.StandardButton.Ok)
+        return
+    model.setColumns(*columns, headers=header)
@@ -0,0 +1,45 @@
+"""Checks the automatic derivatives of expressions against their analytic derivatives"""
+import numpy as np
+import pytest
+
+from algorithms import Algorithms
+from autodiff import derivatives
+
+CASES = [("x**3 - 2*x", lambda x: (x ** 3 - 2 * x, 3 * x ** 2 - 2, 6 * x)),
+         ("sin(x)*exp(x)", lambda x: (np.sin(x) * np.exp(x), np.exp(x) * (np.sin(x) + np.cos(x)),
+                                      2 * np.exp(x) * np.cos(x))),
+         ("log(x)/x", lambda x: (np.log(x) / x, (1 - np.log(x)) / x ** 2, (2 * np.log(x) - 3) / x ** 3)),
+         ("sqrt(x) + tan(x)", lambda x: (np.sqrt(x) + np.tan(x), 0.5 / np.sqrt(x) + 1 / np.cos(x) ** 2,
+                                         -0.25 * x ** -1.5 + 2 * np.tan(x) / np.cos(x) ** 2)),
+         ("2**x + x**x", lambda x: (2 ** x + x ** x, np.log(2) * 2 ** x + x ** x * (np.log(x) + 1),
+                                    np.log(2) ** 2 * 2 ** x + x ** x * ((np.log(x) + 1) ** 2 + 1 / x))),
+         ("1/(1 + x**2)", lambda x: (1 / (1 + x ** 2), -2 * x / (1 + x ** 2) ** 2,
+                                     (6 * x ** 2 - 2) / (1 + x ** 2) ** 3)),
+         ("cos(x)**2 - abs(x)", lambda x: (np.cos(x) ** 2 - np.abs(x), -np.sin(2 * x) - np.sign(x),
+                                           -2 * np.cos(2 * x)))]
+
+
+@pytest.mark.parametrize("text, expected", CASES, ids=[text for text, _ in CASES])
+@pytest.mark.parametrize("x", [0.7, np.linspace(0.2, 1.4, 7)], ids=["float", "array"])
+def test_matches_analytic_derivatives(text, expected, x):
+    for result, value in zip(derivatives(text)(x), expected(x)):
+        np.testing.assert_allclose(result, value, rtol=1e-12)
+
+
+def test_constant_expression():
+    value, first, second = derivatives("2*pi")(np.arange(3.0))
+    np.testing.assert_allclose(value, 2 * np.pi)
+    assert not first.any() and not second.any()
+
+
+def test_newton_raphson_auto_matches_newton_raphson():
+    algorithms = Algorithms()
+    root, count = algorithms.newton_raphson_auto(derivatives("x**3 - 2*x - 5"), 2.0, 1e-12)
+    expected, expected_count = algorithms.newton_raphson(lambda x: x ** 3 - 2 * x - 5, lambda x: 3 * x ** 2 - 2,
+                                                         2.0, 1e-12)
+    assert root == pytest.approx(expected, rel=1e-14) and count == expected_count
+
+
+def test_newtons_method_auto_finds_a_minimum():
+    minimum, _ = Algorithms().newtons_method_auto(derivatives("x**4 - 4*x"), 3.0, 1e-12)
+    assert minimum == pytest.approx(1)
@@ -0,0 +1,115 @@
+"""Checks the integration rules of tabulated data with unevenly spaced x"""
+import numpy as np
+import pytest
+
+from algorithms import Algorithms
+
+algorithms = Algorithms()
+
+
+def quadratic(x):
+    return 3 * x ** 2 - 2 * x + 1
+
+
+def quadratic_integral(x):
+    return x ** 3 - x ** 2 + x
+
+
+@pytest.fixture(params=[40, 41], ids=["even intervals", "odd intervals"])
+def uneven_x(request):
+    return np.sort(np.random.default_rng(request.param).uniform(-1, 2, request.param + 1))
+
+
+def test_simpson_data_is_exact_for_quadratics(uneven_x):
+    expected = quadratic_integral(uneven_x[-1]) - quadratic_integral(uneven_x[0])
+    assert algorithms.simpson_data(uneven_x, quadratic(uneven_x)) == pytest.approx(expected, rel=1e-12)
+
+
+def test_trapezoid_data_is_exact_for_lines(uneven_x):
+    y = 2 * uneven_x - 1
+    expected = (uneven_x[-1] ** 2 - uneven_x[-1]) - (uneven_x[0] ** 2 - uneven_x[0])
+    assert algorithms.trapezoid_data(uneven_x, y) == pytest.approx(expected, rel=1e-12)
+
+
+def test_simpson_data_matches_the_composite_rule_on_even_steps():
+    x = np.linspace(0, 2, 101)
+    assert algorithms.simpson_data(x, np.exp(x)) == pytest.approx(algorithms.simpsons_3rd_rule(np.exp, 0, 2, 100),
+                                                                  rel=1e-13)
+
+
+@pytest.mark.parametrize("rule", ["trapezoid_data", "simpson_data"])
+def test_chunks_and_progress(rule, uneven_x):
+    y = np.sin(uneven_x)
+    read = []
+    whole = getattr(algorithms, rule)(uneven_x, y)
+    assert getattr(algorithms, rule)(uneven_x, y, chunk_size=7, progress=read.append) == pytest.approx(whole,
+                                                                                                      rel=1e-13)
+    assert sum(read) == uneven_x.size - 1
+
+
+@pytest.mark.parametrize("rule", ["trapezoid_data", "simpson_data"])
+def test_decreasing_x_changes_the_sign(rule, uneven_x):
+    # With an odd number of intervals the pairs differ, so the values only agree to the rule's error
+    y = np.cos(uneven_x)
+    method = getattr(algorithms, rule)
+    expected = np.sin(uneven_x[-1]) - np.sin(uneven_x[0])
+    assert method(uneven_x, y) == pytest.approx(expected, rel=1e-2)
+    assert method(uneven_x[::-1], y[::-1]) == pytest.approx(-method(uneven_x, y), rel=1e-3)
+
+
+@pytest.mark.parametrize("rule", ["trapezoid_data", "simpson_data", "cumulative_trapezoid", "cumulative_simpson"])
+def test_bad_data(rule):
+    method = getattr(algorithms, rule)
+    with pytest.raises(ValueError):
+        method([1.0], [2.0])
+    with pytest.raises(ValueError):
+        method([0.0, 1.0, 2.0], [1.0, 2.0])
+
+
+def test_repeated_x_values():
+    with pytest.raises(ValueError):
+        algorithms.simpson_data([0.0, 1.0, 1.0, 2.0, 3.0], [1.0, 2.0, 3.0, 4.0, 5.0])
+
+
+def test_memory_mapped_data(tmp_path):
+    x = np.lib.format.open_memmap(str(tmp_path / "x.npy"), mode="w+", shape=(10_001,))
+    x[:] = np.linspace(0, np.pi, x.size)
+    y = np.sin(x)
+    assert algorithms.simpson_data(x, y, chunk_size=1_000) == pytest.approx(2, rel=1e-12)
+
+
+def test_cumulative_simpson_is_exact_for_quadratics(uneven_x):
+    running = algorithms.cumulative_simpson(uneven_x, quadratic(uneven_x))
+    expected = quadratic_integral(uneven_x) - quadratic_integral(uneven_x[0])
+    np.testing.assert_allclose(running, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_cumulative_trapezoid_is_exact_for_lines(uneven_x):
+    running = algorithms.cumulative_trapezoid(uneven_x, 2 * uneven_x - 1)
+    expected = (uneven_x ** 2 - uneven_x) - (uneven_x[0] ** 2 - uneven_x[0])
+    np.testing.assert_allclose(running, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("rule, total", [("cumulative_trapezoid", "trapezoid_data"),
+                                         ("cumulative_simpson", "simpson_data")])
+def test_cumulative_rules_end_at_the_total(rule, total, uneven_x):
+    y = np.exp(uneven_x)
+    running = getattr(algorithms, rule)(uneven_x, y)
+    assert running[0] == 0 and running.shape == uneven_x.shape
+    assert running[-1] == pytest.approx(getattr(algorithms, total)(uneven_x, y), rel=1e-12)
+    # Every pair of intervals ends on the Simpson integral up to that point
+    assert running[20] == pytest.approx(getattr(algorithms, total)(uneven_x[:21], y[:21]), rel=1e-12)
+
+
+@pytest.mark.parametrize("rule", ["cumulative_trapezoid", "cumulative_simpson"])
+def test_cumulative_chunks_and_progress(rule, uneven_x):
+    y = np.sin(uneven_x)
+    read = []
+    running = getattr(algorithms, rule)(uneven_x, y, chunk_size=7, progress=read.append)
+    np.testing.assert_allclose(running, getattr(algorithms, rule)(uneven_x, y), rtol=1e-13, atol=1e-15)
+    assert sum(read) == uneven_x.size - 1
+
+
+def test_cumulative_simpson_of_sin_matches_the_closed_form():
+    x = np.linspace(0, 2 * np.pi, 2_001)
+    np.testing.assert_allclose(algorithms.cumulative_simpson(x, np.sin(x)), 1 - np.cos(x), atol=1e-10)
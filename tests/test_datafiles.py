@@ -0,0 +1,73 @@
+"""Checks that table data written by save_data reads back, memory mapped where it can be"""
+import numpy as np
+import pytest
+
+from datafiles import load_csv, load_npy, load_npz, save_data
+
+
+@pytest.fixture
+def data():
+    x = np.linspace(0, 1, 1_001)
+    return x, np.exp(x)
+
+
+def test_npz_round_trip_is_memory_mapped(tmp_path, data):
+    path = str(tmp_path / "data.npz")
+    save_data(path, *data, names=("time", "value"))
+    columns, names = load_npz(path)
+    assert names == ["time", "value"]
+    for column, expected in zip(columns, data):
+        assert isinstance(column, np.memmap) and not column.flags.writeable
+        np.testing.assert_array_equal(column, expected)
+
+
+def test_compressed_npz_is_read_into_memory(tmp_path, data):
+    path = str(tmp_path / "data.npz")
+    np.savez_compressed(path, x=data[0], y=data[1].astype(np.float32))
+    columns, names = load_npz(path)
+    assert names == ["x", "y"]
+    assert not any(isinstance(column, np.memmap) for column in columns)
+    assert all(column.dtype == np.float64 for column in columns)
+    np.testing.assert_allclose(columns[1], data[1], rtol=1e-7)
+
+
+def test_npz_with_a_single_2d_member(tmp_path, data):
+    path = str(tmp_path / "data.npz")
+    np.savez(path, table=np.column_stack(data))
+    columns, names = load_npz(path)
+    assert names == ["table 1", "table 2"]
+    np.testing.assert_array_equal(columns[1], data[1])
+
+
+def test_npz_members_of_different_lengths(tmp_path):
+    path = str(tmp_path / "data.npz")
+    np.savez(path, x=np.arange(3.0), y=np.arange(4.0))
+    with pytest.raises(ValueError):
+        load_npz(path)
+
+
+def test_npy_round_trip_is_memory_mapped(tmp_path, data):
+    path = str(tmp_path / "data.npy")
+    save_data(path, *data)
+    columns, names = load_npy(path)
+    assert names == ["column 1", "column 2"]
+    assert all(isinstance(column.base, np.memmap) for column in columns)
+    np.testing.assert_array_equal(columns[0], data[0])
+
+
+def test_npy_of_integers_and_of_3d_arrays(tmp_path):
+    path = str(tmp_path / "data.npy")
+    np.save(path, np.arange(6).reshape(3, 2))
+    columns, _ = load_npy(path)
+    assert columns[1].dtype == np.float64 and columns[1].tolist() == [1, 3, 5]
+    np.save(path, np.zeros((2, 2, 2)))
+    with pytest.raises(ValueError):
+        load_npy(path)
+
+
+def test_csv_round_trip(tmp_path, data):
+    path = str(tmp_path / "data.csv")
+    save_data(path, *data, names=("time", "value"))
+    columns, names = load_csv(path)
+    assert names == ["time", "value"]
+    np.testing.assert_array_equal(columns[1], data[1])
@@ -0,0 +1,80 @@
+"""Checks that decimated series keep their peaks and the shape of the plot"""
+import numpy as np
+import pytest
+
+import decimation
+from decimation import bucket_starts, decimate, finite_range, is_sorted, lttb, minmax, visible_slice
+
+
+@pytest.fixture
+def series():
+    x = np.linspace(0, 10, 100_001)
+    y = np.sin(5 * x) + np.random.default_rng(0).normal(0, 0.01, x.size)
+    y[12_345], y[67_890] = 5.0, -5.0
+    return x, y
+
+
+def test_minmax_keeps_every_bucket_extreme(series):
+    x, y = series
+    small_x, small_y = minmax(x, y, 200)
+    assert small_x.size <= 3 * 200 + 1
+    assert small_x[0] == x[0] and small_x[-1] == x[-1]
+    assert np.all(np.diff(small_x) > 0)
+    assert small_y.max() == 5 and small_y.min() == -5
+    starts = bucket_starts(x, 200, True)
+    for start, stop in zip(starts, np.append(starts[1:], x.size)):
+        assert {y[start:stop].argmin() + start, y[start:stop].argmax() + start} <= set(np.searchsorted(x, small_x))
+
+
+def test_minmax_does_not_depend_on_the_chunk_size(series, monkeypatch):
+    x, y = series
+    expected = minmax(x, y, 300)
+    monkeypatch.setattr(decimation, "CHUNK_SIZE", 1_000)
+    for result, value in zip(minmax(x, y, 300), expected):
+        np.testing.assert_array_equal(result, value)
+
+
+def test_minmax_ignores_nans(series):
+    x, y = series
+    y = y.copy()
+    y[:50_000] = np.nan
+    small_x, small_y = minmax(x, y, 100)
+    assert np.nanmax(small_y) == np.nanmax(y) and np.nanmin(small_y) == -5
+    assert small_x.size <= 3 * 100 + 1
+
+
+def test_minmax_of_unsorted_x():
+    x = np.random.default_rng(1).random(10_000)
+    y = x ** 2
+    small_x, small_y = minmax(x, y, 50, sorted_x=False)
+    assert small_y.max() == y.max() and small_y.min() == y.min()
+    assert small_x.size <= 3 * 50 + 1
+
+
+def test_lttb_keeps_the_ends_and_the_point_count(series):
+    x, y = series
+    small_x, small_y = lttb(x, y, 500)
+    assert small_x.size == 500
+    assert (small_x[0], small_x[-1]) == (x[0], x[-1])
+    assert np.all(np.diff(small_x) > 0)
+    assert 5 in small_y and -5 in small_y
+
+
+def test_decimate_leaves_small_series_alone():
+    x = np.arange(100.0)
+    small_x, small_y = decimate(x, x, 800)
+    assert small_x is x and small_y is x
+
+
+def test_decimate_rejects_unknown_methods(series):
+    with pytest.raises(ValueError):
+        decimate(*series, 100, method="every_nth")
+
+
+def test_helpers():
+    x = np.arange(10.0)
+    assert is_sorted(x) and not is_sorted(x[::-1])
+    assert finite_range(np.array([np.nan, 3, -np.inf, -2])) == (-2, 3)
+    assert finite_range(np.array([np.nan])) is None
+    assert visible_slice(x, 2.5, 6.5) == slice(2, 8)
+    assert visible_slice(x, -5, 50) == slice(0, 10)
@@ -0,0 +1,36 @@
+"""Checks that compiled expressions give the same results as evaluating their text"""
+import numpy as np
+import pytest
+
+from expression import ARRAY_THRESHOLD, NAMESPACE, compile_expression
+
+EXPRESSIONS = ["x**2 - 4*x", "sin(x) + cos(x)**2", "exp(-x**2/2) / sqrt(2*pi)", "x + tan(pi)**0.5",
+               "sqrt(x) + cos(pi)**0.5", "x + 1/sin(0)", "x*2**0.5 + e", "-x + (-8)**(1/3)",
+               "log(x) - log(2)*x", "abs(x - 3) + sin(pi/4)*x", "x//2 + x % 3", "(x + 1)*(x + 1) - x**3",
+               "1/(x - 2)", "tan(x)**0.5 + 1/cos(0)"]
+
+INPUTS = [0.0, 0.1, 2.0, -1.5, 3, np.float64(0.7), np.linspace(-5, 5, 11),
+          np.linspace(-5, 5, ARRAY_THRESHOLD + 1)]
+
+
+def evaluate(text, x):
+    """The result of the plain eval of text, or the type of the error it raises"""
+    try:
+        return eval(text, {"__builtins__": {}, **NAMESPACE, "x": x})
+    except ArithmeticError as error:
+        return type(error)
+
+
+@pytest.mark.parametrize("text", EXPRESSIONS)
+@pytest.mark.parametrize("x", INPUTS, ids=lambda x: f"{type(x).__name__}{np.size(x)}")
+def test_matches_eval(text, x):
+    function = compile_expression(text)
+    with np.errstate(all="ignore"):
+        expected = evaluate(text, x)
+        if isinstance(expected, type):
+            with pytest.raises(expected):
+                function(x)
+            return
+        result = function(x)
+    assert np.iscomplexobj(result) == np.iscomplexobj(expected)
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=0, equal_nan=True)
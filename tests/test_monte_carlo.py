@@ -0,0 +1,66 @@
+"""Checks the Monte Carlo integrator and its standard error"""
+import numpy as np
+import pytest
+
+from algorithms import Algorithms
+
+algorithms = Algorithms()
+SAMPLINGS = ["plain", "antithetic", "stratified"]
+
+
+@pytest.mark.parametrize("sampling", SAMPLINGS)
+def test_needs_a_sample(sampling):
+    with pytest.raises(ValueError):
+        algorithms.monte_carlo(np.sin, 0, np.pi, 0, sampling=sampling)
+
+
+@pytest.mark.parametrize("sampling", SAMPLINGS)
+def test_estimate_is_within_its_error(sampling):
+    value, error = algorithms.monte_carlo(np.sin, 0, np.pi, 100_001, seed=1, sampling=sampling)
+    assert 0 < error < 0.01
+    assert abs(value - 2) < 5 * error
+
+
+@pytest.mark.parametrize("sampling", SAMPLINGS)
+def test_same_seed_gives_the_same_estimate(sampling):
+    first = algorithms.monte_carlo(np.exp, 0, 1, 5_000, seed=7, sampling=sampling, batch_size=1_000)
+    second = algorithms.monte_carlo(np.exp, 0, 1, 5_000, seed=7, sampling=sampling, batch_size=1_000)
+    assert first == second
+
+
+def test_antithetic_sampling_draws_exactly_n_samples():
+    calls = []
+
+    def f(x):
+        calls.append(np.size(x))
+        return x
+
+    algorithms.monte_carlo(f, 0, 1, 7, seed=0, sampling="antithetic")
+    assert sum(calls) == 7
+
+
+def test_antithetic_sampling_is_exact_for_a_line():
+    value, error = algorithms.monte_carlo(lambda x: 3 * x + 1, 0, 2, 1_000, seed=0, sampling="antithetic")
+    assert value == pytest.approx(8) and error == pytest.approx(0, abs=1e-12)
+
+
+def test_stratified_remainder_goes_into_the_last_block():
+    calls = []
+
+    def f(x):
+        calls.append(np.size(x))
+        return x ** 2
+
+    algorithms.monte_carlo(f, 0, 1, 2_002, seed=0, sampling="stratified", batch_size=1_000)
+    assert calls == [667, 667, 668]
+
+
+def test_tolerance_stops_early():
+    calls = []
+
+    def f(x):
+        calls.append(np.size(x))
+        return np.cos(x)
+
+    _, error = algorithms.monte_carlo(f, 0, 1, 10 ** 7, seed=0, tol=1e-2, batch_size=1_000)
+    assert error <= 1e-2 and sum(calls) < 10 ** 7
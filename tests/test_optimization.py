@@ -0,0 +1,68 @@
+"""Checks the optimization methods and the evaluation counts of the solvers"""
+import math
+
+import numpy as np
+import pytest
+
+from algorithms import Algorithms, CountedFunction
+
+algorithms = Algorithms()
+
+
+def test_counted_function_counts_calls_and_points():
+    f = CountedFunction(np.sin)
+    f(1.0)
+    f(np.zeros(10))
+    assert (f.calls, f.evaluations) == (2, 11)
+    f.reset()
+    assert (f.calls, f.evaluations) == (0, 0)
+
+
+def test_golden_section_search_evaluates_one_point_per_iteration():
+    f = CountedFunction(lambda x: (x - 2) ** 2)
+    minimum, count = algorithms.golden_section_search(f, 0, 5, tol=1e-8)
+    assert minimum == pytest.approx(2, abs=1e-7)
+    assert f.evaluations == count + 2
+
+
+def test_golden_section_batch():
+    minima, counts = algorithms.golden_section_batch(lambda x: np.cos(x), [2, 8], [4, 11], tol=1e-9)
+    np.testing.assert_allclose(minima, [np.pi, 3 * np.pi], atol=1e-8)
+    assert (counts > 0).all()
+
+
+def test_parabolic_interpolation_finds_a_vertex_at_once():
+    f = CountedFunction(lambda x: 3 * (x - 1.5) ** 2 + 2)
+    minimum, count = algorithms.parabolic_interpolation(f, 0, 1, 4)
+    assert minimum == pytest.approx(1.5)
+    assert count == 2 and f.evaluations == 4
+
+
+def test_parabolic_interpolation_converges():
+    f = CountedFunction(math.cosh)
+    minimum, count = algorithms.parabolic_interpolation(f, -1, 0.5, 2)
+    assert minimum == pytest.approx(0, abs=1e-6)
+    assert f.evaluations == count + 2
+
+
+def test_newtons_method_evaluates_each_derivative_once_per_step():
+    df = CountedFunction(lambda x: 4 * x ** 3 - 4)
+    dff = CountedFunction(lambda x: 12 * x ** 2)
+    minimum, count = algorithms.newtons_method(df, dff, 3.0, 1e-12)
+    assert minimum == pytest.approx(1)
+    assert df.calls == count and dff.calls == count - 1
+
+
+def test_newton_raphson_evaluates_f_once_per_step():
+    f = CountedFunction(lambda x: x ** 2 - 2)
+    root, count = algorithms.newton_raphson(f, lambda x: 2 * x, 1.0, 1e-12)
+    assert root == pytest.approx(math.sqrt(2))
+    assert f.calls == count
+
+
+@pytest.mark.parametrize("method", ["regula_falsi_algorithm", "illinois_algorithm"])
+def test_bracketing_evaluates_f_once_per_step(method):
+    f = CountedFunction(lambda x: x ** 3 - 2)
+    root, count = getattr(algorithms, method)(f, 0, 2, margin=1e-10)
+    assert root == pytest.approx(2 ** (1 / 3))
+    assert f.calls == count + 2
@@ -0,0 +1,137 @@
+"""Checks the quadrature rules against integrals with a closed form"""
+import math
+
+import numpy as np
+import pytest
+
+from algorithms import GAUSS_LEGENDRE_CACHE, Algorithms
+
+algorithms = Algorithms()
+COMPOSITE_RULES = ["simpsons_3rd_rule", "simpsons_8th_rule", "trapazoidal_rule"]
+
+
+def cubic(x):
+    return 4 * x ** 3 - 3 * x ** 2 + 2 * x - 1
+
+
+def cubic_integral(a, b):
+    return (b ** 4 - b ** 3 + b ** 2 - b) - (a ** 4 - a ** 3 + a ** 2 - a)
+
+
+@pytest.mark.parametrize("rule", ["simpsons_3rd_rule", "simpsons_8th_rule"])
+def test_simpson_rules_are_exact_for_cubics(rule):
+    assert getattr(algorithms, rule)(cubic, -1, 2, 6) == pytest.approx(cubic_integral(-1, 2), rel=1e-12)
+
+
+def test_trapezoidal_rule_is_exact_for_lines():
+    assert algorithms.trapazoidal_rule(lambda x: 3 * x - 2, -1, 2, 7) == pytest.approx(-1.5, rel=1e-12)
+
+
+@pytest.mark.parametrize("rule", COMPOSITE_RULES)
+def test_vectorized_matches_the_loop(rule):
+    method = getattr(algorithms, rule)
+    vectorized = method(np.exp, 0, 1, 600, vectorized=True)
+    looped = method(math.exp, 0, 1, 600, vectorized=False)
+    assert vectorized == pytest.approx(looped, rel=1e-13)
+    assert vectorized == pytest.approx(math.e - 1, rel=1e-6)
+
+
+@pytest.mark.parametrize("rule", COMPOSITE_RULES)
+def test_chunks_do_not_change_the_result(rule):
+    method = getattr(algorithms, rule)
+    assert method(np.sin, 0, 3, 6_000, chunk_size=1_000) == pytest.approx(method(np.sin, 0, 3, 6_000), rel=1e-13)
+
+
+@pytest.mark.parametrize("rule", COMPOSITE_RULES)
+def test_scalar_functions_fall_back_to_the_loop(rule):
+    assert getattr(algorithms, rule)(math.cos, 0, 1, 600) == pytest.approx(math.sin(1), rel=1e-6)
+
+
+@pytest.mark.parametrize("rule", COMPOSITE_RULES)
+def test_empty_interval(rule):
+    assert getattr(algorithms, rule)(np.exp, 1.5, 1.5, 6) == 0
+
+
+@pytest.mark.parametrize("rule", COMPOSITE_RULES)
+def test_reversed_limits_change_the_sign(rule):
+    method = getattr(algorithms, rule)
+    assert method(np.exp, 2, 0, 600) == pytest.approx(-method(np.exp, 0, 2, 600), rel=1e-13)
+
+
+@pytest.mark.parametrize("rule", ["adaptive_simpson", "gauss_kronrod"])
+def test_adaptive_rules_meet_the_tolerance(rule):
+    value, error, evals = getattr(algorithms, rule)(lambda x: np.sqrt(x), 0, 1, tol=1e-8)
+    assert value == pytest.approx(2 / 3, abs=1e-8)
+    assert error <= 1e-8 and evals <= 100_000
+
+
+@pytest.mark.parametrize("rule", ["adaptive_simpson", "gauss_kronrod"])
+def test_adaptive_rules_stop_at_max_evals(rule):
+    _, _, evals = getattr(algorithms, rule)(lambda x: np.sin(1 / x), 1e-3, 1, tol=1e-14, max_evals=500)
+    assert evals <= 500
+
+
+@pytest.mark.parametrize("rule", ["adaptive_simpson", "gauss_kronrod"])
+def test_adaptive_rules_on_an_empty_interval(rule):
+    value, error, _ = getattr(algorithms, rule)(np.exp, 2, 2)
+    assert value == 0 and error == 0
+
+
+@pytest.mark.parametrize("rule", ["adaptive_simpson", "gauss_kronrod"])
+def test_adaptive_rules_with_reversed_limits(rule):
+    value, _, _ = getattr(algorithms, rule)(np.exp, 1, 0)
+    assert value == pytest.approx(1 - math.e, abs=1e-8)
+
+
+def test_romberg_converges():
+    value, error, evals = algorithms.romberg(np.exp, 0, 1, tol=1e-12)
+    assert value == pytest.approx(math.e - 1, abs=1e-12)
+    assert error <= 1e-12 and evals < 100
+
+
+def test_romberg_only_evaluates_new_midpoints():
+    nodes = []
+
+    def f(x):
+        nodes.extend(np.atleast_1d(x))
+        return np.cos(x)
+
+    _, _, evals = algorithms.romberg(f, 0, 1, max_steps=5, tol=0)
+    assert evals == len(nodes) == len(set(nodes)) == 2 ** 5 + 1
+
+
+def test_romberg_on_an_empty_interval():
+    assert algorithms.romberg(np.exp, 1, 1)[0] == 0
+
+
+def test_romberg_with_reversed_limits():
+    assert algorithms.romberg(np.exp, 1, 0)[0] == pytest.approx(1 - math.e, abs=1e-10)
+
+
+@pytest.mark.parametrize("m", [1, 2, 5, 10])
+def test_gauss_legendre_is_exact_to_degree_2m_minus_1(m):
+    degree = 2 * m - 1
+    value = algorithms.gauss_legendre(lambda x: (degree + 1) * x ** degree, 0, 2, m=m)
+    assert value == pytest.approx(2.0 ** (degree + 1), rel=1e-12)
+
+
+def test_composite_gauss_legendre_with_chunks():
+    value = algorithms.gauss_legendre(np.sin, 0, np.pi, m=4, n=1_000, chunk_size=100)
+    assert value == pytest.approx(algorithms.gauss_legendre(np.sin, 0, np.pi, m=4, n=1_000), rel=1e-13)
+    assert value == pytest.approx(2, rel=1e-12)
+
+
+def test_gauss_legendre_empty_interval_and_reversed_limits():
+    assert algorithms.gauss_legendre(np.exp, 1, 1, m=5) == 0
+    assert algorithms.gauss_legendre(np.exp, 1, 0, m=5, n=4) == pytest.approx(1 - math.e, rel=1e-12)
+
+
+def test_gauss_nodes_round_trip(tmp_path):
+    nodes, weights = algorithms.gauss_legendre_nodes(7)
+    path = tmp_path / "nodes.npz"
+    algorithms.save_gauss_nodes(path)
+    del GAUSS_LEGENDRE_CACHE[7]
+    algorithms.load_gauss_nodes(path)
+    loaded_nodes, loaded_weights = algorithms.gauss_legendre_nodes(7)
+    np.testing.assert_array_equal(loaded_nodes, nodes)
+    np.testing.assert_array_equal(loaded_weights, weights)
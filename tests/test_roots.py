@@ -0,0 +1,143 @@
+"""Checks the root solvers against functions with known roots"""
+import numpy as np
+import pytest
+
+from algorithms import CONVERGED, DIVERGED, MAX_ITERATIONS, ZERO_DIVISION, Algorithms
+
+algorithms = Algorithms()
+
+
+def test_find_all_roots_of_sin():
+    roots, counts = algorithms.find_all_roots(np.sin, -10, 10)
+    np.testing.assert_allclose(roots, np.pi * np.arange(-3, 4), atol=1e-5)
+    assert counts.shape == roots.shape
+
+
+def test_find_all_roots_on_the_interval_ends():
+    roots, _ = algorithms.find_all_roots(np.sin, 0, 2 * np.pi)
+    np.testing.assert_allclose(roots, [0, np.pi, 2 * np.pi], atol=1e-5)
+
+
+def test_find_all_roots_of_a_double_root():
+    roots, _ = algorithms.find_all_roots(lambda x: (x - 1) ** 2, -2, 3)
+    np.testing.assert_allclose(roots, [1], atol=1e-2)
+
+
+def test_find_all_roots_skips_poles():
+    roots, counts = algorithms.find_all_roots(np.tan, 1, 2)
+    assert roots.size == counts.size == 0
+    roots, _ = algorithms.find_all_roots(np.tan, -4, 4)
+    np.testing.assert_allclose(roots, [-np.pi, 0, np.pi], atol=1e-5)
+
+
+def test_find_all_roots_of_a_target_value():
+    roots, _ = algorithms.find_all_roots(lambda x: x ** 3, -2, 2, y=1)
+    np.testing.assert_allclose(roots, [1], atol=1e-5)
+
+
+@pytest.mark.parametrize("method", ["bisection", "regula_falsi", "illinois"])
+def test_bracket_batch_marks_a_pole_as_unconverged(method):
+    root, count = algorithms.bracket_batch(np.tan, 1, 2, method=method, max_iter=50)
+    assert np.isnan(root) and count == 50
+
+
+@pytest.mark.parametrize("method", ["bisection", "regula_falsi", "illinois"])
+def test_bracket_batch_solves_every_lane(method):
+    targets = np.linspace(-8, 8, 12).reshape(3, 4)
+    roots, counts = algorithms.bracket_batch(lambda x: x ** 3, -3, 3, targets, 1e-9, method)
+    assert roots.shape == counts.shape == (3, 4)
+    np.testing.assert_allclose(roots ** 3, targets, atol=1e-9)
+    assert (counts > 0).all()
+
+
+@pytest.mark.parametrize("method", ["bisection", "regula_falsi", "illinois"])
+def test_bracket_batch_with_decreasing_functions(method):
+    roots, _ = algorithms.bracket_batch(lambda x: 1 - x, [0, 2], [2, 0], method=method)
+    np.testing.assert_allclose(roots, [1, 1], atol=1e-5)
+
+
+def test_bracket_batch_skips_targets_outside_the_bracket():
+    roots, counts = algorithms.bisection_batch(np.exp, 0, 1, [0.5, 2, 3])
+    assert np.isnan(roots[[0, 2]]).all() and (counts[[0, 2]] == 0).all()
+    assert roots[1] == pytest.approx(np.log(2), abs=1e-5)
+
+
+@pytest.mark.parametrize("method", ["bisection_algorithm", "regula_falsi_algorithm", "illinois_algorithm"])
+def test_bracket_batch_matches_the_scalar_solvers(method):
+    batch = getattr(algorithms, method.replace("algorithm", "batch"))
+    root, _ = getattr(algorithms, method)(np.cos, 0, 3)
+    batch_root, _ = batch(np.cos, 0, 3)
+    assert batch_root == pytest.approx(root, abs=1e-5)
+
+
+def test_bracket_batch_rejects_unknown_methods():
+    with pytest.raises(ValueError):
+        algorithms.bracket_batch(np.sin, 1, 4, method="brent")
+
+
+def test_newton_raphson_batch():
+    seeds = np.array([[1.0, 3.0], [-2.0, 10.0]])
+    roots, counts, status = algorithms.newton_raphson_batch(lambda x: x ** 2 - 2, lambda x: 2 * x, seeds, 1e-12)
+    assert roots.shape == counts.shape == status.shape == (2, 2)
+    np.testing.assert_allclose(roots, np.sign(seeds) * np.sqrt(2), rtol=1e-12)
+    assert (status == CONVERGED).all()
+
+
+def test_newton_raphson_batch_reports_a_flat_seed():
+    roots, _, status = algorithms.newton_raphson_batch(lambda x: x ** 2 - 2, lambda x: 2 * x, [0.0, 1.0], 1e-12)
+    assert status.tolist() == [ZERO_DIVISION, CONVERGED]
+    assert roots[0] == 0
+
+
+def test_newton_raphson_batch_stops_at_max_iter():
+    _, counts, status = algorithms.newton_raphson_batch(lambda x: x ** 2 + 1, lambda x: 2 * x, [0.5], 1e-12,
+                                                        max_iter=20)
+    assert counts[0] == 20 and status[0] == MAX_ITERATIONS
+
+
+def test_secant_batch():
+    roots, _, status = algorithms.secant_batch(np.cos, [0.5, 4.0], [1.0, 4.5], margin=1e-12)
+    np.testing.assert_allclose(roots, [np.pi / 2, 3 * np.pi / 2], rtol=1e-10)
+    assert (status == CONVERGED).all()
+
+
+def test_secant_batch_with_a_root_seed():
+    roots, counts, status = algorithms.secant_batch(np.sin, [0.0, 1.0], [1.0, np.pi])
+    assert roots.tolist() == [0.0, np.pi] and counts.tolist() == [0, 0]
+    assert (status == CONVERGED).all()
+
+
+def test_steffensen_batch():
+    targets = np.array([1.0, 2.0, 5.0])
+    roots, _, status = algorithms.steffensen_batch(lambda x: x ** 3, 1.5, targets, margin=1e-12)
+    np.testing.assert_allclose(roots, np.cbrt(targets), rtol=1e-10)
+    assert (status == CONVERGED).all()
+
+
+def test_newton_raphson_batch_reports_divergence():
+    # The first step from 5 lands below 0, where sqrt is nan
+    roots, _, status = algorithms.newton_raphson_batch(lambda x: np.sqrt(x) - 1, lambda x: 0.5 / np.sqrt(x),
+                                                       [5.0, 1.5], 1e-12)
+    assert status.tolist() == [DIVERGED, CONVERGED]
+    assert roots[1] == pytest.approx(1)
+
+
+@pytest.mark.parametrize("f, a, b, root", [(lambda x: x ** 3 - 2 * x - 5, 2, 3, 2.0945514815423265),
+                                           (np.cos, 0, 3, np.pi / 2),
+                                           (lambda x: np.exp(x) - 10, 0, 5, np.log(10)),
+                                           (lambda x: 1 - x, 3, -1, 1)])
+def test_brent_algorithm(f, a, b, root):
+    found, count, evals = algorithms.brent_algorithm(f, a, b, margin=1e-12)
+    assert found == pytest.approx(root, abs=1e-10)
+    assert evals == count + 1
+
+
+def test_brent_algorithm_needs_fewer_evaluations_than_bisection():
+    _, _, evals = algorithms.brent_algorithm(np.cos, 0, 3, margin=1e-12)
+    _, count = algorithms.bisection_algorithm(np.cos, 0, 3, margin=1e-12)
+    assert evals < count
+
+
+def test_brent_algorithm_rejects_a_target_outside_the_bracket():
+    with pytest.raises(AssertionError):
+        algorithms.brent_algorithm(np.exp, 0, 1, y=5)
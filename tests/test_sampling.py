@@ -0,0 +1,53 @@
+"""Checks that the adaptive sampler follows the curvature of functions and breaks at poles"""
+import math
+
+import numpy as np
+import pytest
+
+from sampling import INITIAL_POINTS, adaptive_sample
+
+
+def test_straight_lines_are_not_refined():
+    # Only the midpoints of the coarse grid are checked
+    x, y, evals = adaptive_sample(lambda x: 3 * x - 1, -2, 2, initial=33)
+    assert evals == x.size == 2 * 33 - 1
+    np.testing.assert_allclose(y, 3 * x - 1)
+
+
+def test_curved_parts_get_more_points():
+    x, y, evals = adaptive_sample(lambda x: np.exp(-20_000 * x ** 2), -1, 1, 800, 600)
+    assert evals == x.size and np.all(np.diff(x) > 0)
+    # The peak takes 2% of the interval and most of the points
+    assert np.count_nonzero(np.abs(x) < 0.02) > np.count_nonzero(np.abs(x) > 0.02)
+    # Linear interpolation of the samples is within a pixel of the function
+    t = np.linspace(-1, 1, 400_001)
+    assert np.max(np.abs(np.interp(t, x, y) - np.exp(-20_000 * t ** 2))) < 1 / 600
+
+
+def test_poles_get_a_break():
+    x, y, _ = adaptive_sample(np.tan, 0, 3)
+    pole = np.searchsorted(x, np.pi / 2)
+    assert np.isnan(y[pole - 2:pole + 2]).any()
+    finite = np.isfinite(y)
+    # No finite segment crosses the pole
+    crossing = (x[:-1] < np.pi / 2) & (x[1:] > np.pi / 2) & finite[:-1] & finite[1:]
+    assert not crossing.any()
+
+
+def test_budget_is_respected():
+    x, y, evals = adaptive_sample(lambda x: np.sin(1 / x), 0.01, 1, max_evals=2_000)
+    assert evals <= 2_000 and np.count_nonzero(np.isfinite(y)) == evals
+
+
+def test_scalar_functions():
+    x, y, _ = adaptive_sample(math.sin, 0, 6, initial=65)
+    np.testing.assert_allclose(y, np.sin(x))
+
+
+def test_reversed_and_empty_intervals():
+    x, y, evals = adaptive_sample(lambda x: np.exp(-20_000 * x ** 2), 1, -1)
+    expected_x, expected_y, expected_evals = adaptive_sample(lambda x: np.exp(-20_000 * x ** 2), -1, 1)
+    np.testing.assert_array_equal(x, expected_x)
+    assert evals == expected_evals > 2 * INITIAL_POINTS
+    x, y, _ = adaptive_sample(np.sin, 1, 1, initial=9)
+    assert np.all(x == 1) and np.all(y == np.sin(1))
@@ -0,0 +1,159 @@
+"""This module contains the worker layer that runs Algorithms calls off the GUI thread"""
+import time
+
+import numpy as np
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton, QMessageBox
+
+# Titles of the warning shown for an error raised by a job
+ERROR_TITLES = {SyntaxError: "Syntax Error", TypeError: "Type Error",
+                ValueError: "Value Error", AssertionError: "Value Error",
+                RuntimeError: "Runtime Error", OverflowError: "Overflow Error",
+                ZeroDivisionError: "Division by zero Error", NameError: "Name Error"}
+
+# Seconds between two progress reports of a job
+PROGRESS_INTERVAL = 0.1
+
+
+def showError(parent, error):
+    """Shows a warning message box for an error raised by a job"""
+    title = next((title for kind, title in ERROR_TITLES.items() if isinstance(error, kind)), "Error")
+    QMessageBox.warning(parent, title, f"{error}", QMessageBox.StandardButton.Ok)
+
+
+class Cancelled(Exception):
+    """Raised inside a job once its worker has been cancelled"""
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(object)
+
+
+class MonitoredFunction:
+    """Wraps a function of a job, reporting progress and stopping the job once it is cancelled
+
+    Every call adds the number of points of x to the progress of the worker.
+    """
+    def __init__(self, f, worker):
+        self.f = f
+        self.worker = worker
+
+    def __call__(self, x):
+        self.worker.progress(np.size(x))
+        return self.f(x)
+
+
+class Worker(QRunnable):
+    """Runs job(monitor) on the thread pool
+
+    monitor is the worker itself: monitor(f) wraps a function the job evaluates, see
+    MonitoredFunction, and monitor.progress(count) reports work that is not a function
+    evaluation, such as bytes read or shards done.
+    """
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = WorkerSignals()
+        self.cancelled = False
+        self.evaluations = 0
+        self.reported = time.monotonic()
+
+    def __call__(self, f):
+        """Returns f wrapped to report progress and allow cancellation, see MonitoredFunction"""
+        return MonitoredFunction(f, self)
+
+    def progress(self, count):
+        """Adds count to the progress of the job, raises Cancelled once it is cancelled"""
+        if self.cancelled:
+            raise Cancelled()
+        self.evaluations += count
+        if (now := time.monotonic()) - self.reported >= PROGRESS_INTERVAL:
+            self.reported = now
+            self.signals.progress.emit(self.evaluations)
+
+    def cancel(self):
+        """Asks the job to stop at its next function evaluation or progress report"""
+        self.cancelled = True
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.job(self)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as error:
+            self.signals.error.emit(error)
+        else:
+            self.signals.finished.emit(result)
+
+
+class JobRunner(QWidget):
+    """Progress bar and Cancel button running one job at a time for a tab"""
+    busy = pyqtSignal(bool)
+
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.unit, self.total = "evaluations", None
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setTextVisible(False)
+        self.progress_label = QLabel("")
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel)
+
+        runner_hbox = QHBoxLayout()
+        runner_hbox.setContentsMargins(0, 0, 0, 0)
+        runner_hbox.addWidget(self.progress_bar, stretch=1)
+        runner_hbox.addWidget(self.progress_label)
+        runner_hbox.addWidget(self.cancel_btn)
+        self.setLayout(runner_hbox)
+
+    def start(self, job, on_finished, unit="evaluations", total=None):
+        """Runs job(monitor) in the background and calls on_finished with its result
+
+        The progress is shown in unit, and as a fraction of total when it is known.
+        """
+        self.cancel()
+        self.unit, self.total = unit, total
+        worker = self.worker = Worker(job)
+        worker.signals.finished.connect(lambda result: self.done(worker) and on_finished(result))
+        worker.signals.error.connect(lambda error: self.done(worker) and showError(self.parent(), error))
+        worker.signals.cancelled.connect(lambda: self.done(worker) and self.progress_label.setText("Cancelled"))
+        worker.signals.progress.connect(self.showProgress)
+
+        # The bar is busy until the total is known
+        self.progress_bar.setRange(0, 0 if total is None else 1000)
+        self.progress_bar.setValue(0)
+        self.progress_label.setText("")
+        self.cancel_btn.setEnabled(True)
+        self.busy.emit(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def showProgress(self, count):
+        self.progress_label.setText(f"{count} {self.unit}")
+        if self.total:
+            self.progress_bar.setValue(min(int(1000 * count / self.total), 1000))
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def done(self, worker):
+        """Resets the progress widgets, returns False for the signals of an outdated worker"""
+        if worker is not self.worker:
+            return False
+        self.worker = None
+        self.progress_bar.setRange(0, 1)
+        self.progress_label.setText(f"{worker.evaluations} {self.unit}")
+        self.cancel_btn.setEnabled(False)
+        self.busy.emit(False)
+        return True
+
+    def wait(self):
+        """Blocks until every started job has finished"""
+        QThreadPool.globalInstance().waitForDone()